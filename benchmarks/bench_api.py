@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+from benchmarks.common import measure
+from utils.request_scheduler import RequestScheduler
+from utils.stub_server import FixtureStore, StubServer
+from utils.tmdb_client import TMDBClient
+
+CATALOGUE_SIZE = 2000
+PAGES = 40
+CONCURRENCY_LEVELS = [1, 4, 16]
+# Emulated per-request network latency so concurrency has something to hide
+LATENCY_MS = 20
+
+
+# Deterministic synthetic catalogue: the benchmark measures the client, not the recordings
+def _synthetic_store(root):
+    store = FixtureStore(root)
+    store.add_to_catalogue("movie", [
+        {
+            "id": i,
+            "title": f"Movie {i}",
+            "release_date": f"{1950 + i % 75}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "vote_average": round(i % 100 / 10, 1),
+            "popularity": float(CATALOGUE_SIZE - i),
+            "genre_ids": [28 if i % 2 else 18],
+        }
+        for i in range(CATALOGUE_SIZE)
+    ])
+    return store
+
+
+def run():
+    root = tempfile.mkdtemp(prefix="bench-tmdb-")
+    server = StubServer(mode="replay", port=0, latency_ms=LATENCY_MS, store=_synthetic_store(root)).start()
+    results = {}
+    try:
+        for concurrency in CONCURRENCY_LEVELS:
+            client = TMDBClient(base_url=f"{server.url}/3", max_connections=concurrency,
+                                scheduler=RequestScheduler(max_in_flight=concurrency))
+            try:
+                def fetch_pages():
+                    client.run_concurrently(
+                        [lambda page=page: client.discover_movies(page=page) for page in range(1, PAGES + 1)]
+                    )
+
+                seconds = measure(fetch_pages, repeat=3)
+            finally:
+                client.close()
+            results[f"api.discover_{PAGES}_pages.concurrency_{concurrency}"] = seconds
+    finally:
+        server.stop()
+        shutil.rmtree(root, ignore_errors=True)
+    return results
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from benchmarks.common import BENCH_DIR, measure
+
+ROOT = os.path.dirname(BENCH_DIR)
+# Collection runs without the HTML report and cache so only startup/collection is timed
+PYTEST = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-o", "addopts=", "-p", "no:cacheprovider"]
+COLLECT_CASES = {"all": [], "api": ["-m", "api"], "ui": ["-m", "ui"]}
+# Modules an API-only run must never import
+UI_ONLY_MODULES = ("selenium.webdriver.remote.webdriver", "pages.home_page", "utils.driver_factory", "PIL")
+
+
+def _run(command):
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+# Module -> cumulative import time in seconds, from `python -X importtime`
+def _import_times(command):
+    times = {}
+    for line in _run(command[:1] + ["-X", "importtime"] + command[1:]).stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def run():
+    results = {}
+    conftest_times = _import_times([sys.executable, "-c", "import pytest, conftest"])
+    results["startup.import.conftest"] = conftest_times["conftest"]
+
+    for name, args in COLLECT_CASES.items():
+        results[f"startup.collect.{name}"] = measure(lambda: _run(PYTEST + args), repeat=3)
+
+    # pytest captures stderr during collection; --capture=no lets the import timings through
+    loaded = _import_times(PYTEST + COLLECT_CASES["api"] + ["--capture=no"])
+    leaked = [module for module in UI_ONLY_MODULES if module in loaded]
+    if leaked:
+        raise AssertionError(f"`pytest -m api` imported UI-only modules: {', '.join(leaked)}")
+    return results
@@ -0,0 +1,90 @@
+from selenium.webdriver.support import expected_conditions as EC
+from benchmarks.common import measure
+from pages.home_page import HomePage
+from utils.config import BASE_URL
+from utils.driver_factory import create_driver, quit_driver
+from utils.stub_server import FixtureStore
+
+GRID_SIZES = [20, 100, 500]
+
+# Synthetic grid with the same structure the HomePage locators target
+BUILD_GRID_SCRIPT = """
+var grid = document.createElement('div');
+for (var i = 0; i < arguments[0]; i++) {
+  var card = document.createElement('div');
+  card.className = 'flex flex-col items-center';
+  card.innerHTML = '<p>Movie ' + i + '</p><p>Action, ' + (1950 + i % 75) + '</p>';
+  grid.appendChild(card);
+}
+document.body.innerHTML = '';
+document.body.appendChild(grid);
+"""
+
+
+def _per_element_extraction(home):
+    # What the getters did before snapshot_results(): one .text round trip per element
+    titles = [el.text for el in home.driver.find_elements(*home.MOVIE_TITLES)]
+    metas = [el.text for el in home.driver.find_elements(*home.MOVIE_META)]
+    return titles, metas
+
+
+def _bench_extraction(driver, results):
+    home = HomePage(driver)
+    for size in GRID_SIZES:
+        driver.get("about:blank")
+        driver.execute_script(BUILD_GRID_SCRIPT, size)
+        results[f"ui.snapshot_results.cards_{size}"] = measure(home.snapshot_results, repeat=5)
+        results[f"ui.per_element_text.cards_{size}"] = measure(lambda: _per_element_extraction(home), repeat=3)
+
+
+def _bench_actions(driver, results):
+    home = HomePage(driver)
+
+    def fresh():
+        driver.get(BASE_URL)
+        home.wait_for_results()
+
+    def select_category():
+        fresh()
+        home.select_category("Popular")
+        home.wait_for_results()
+
+    def select_type():
+        fresh()
+        home.select_type("Movie")
+        home.wait.until(EC.text_to_be_present_in_element(home.SELECTED_TYPE, "Movie"))
+
+    def select_year_range():
+        fresh()
+        home.select_year_range(2000, 2020)
+
+    def next_page():
+        fresh()
+        previous = home.results_signature()
+        home.click_next_page()
+        home.wait_for_results_changed(previous)
+
+    results["ui.home_load"] = measure(fresh, repeat=3)
+    for name, action in [
+        ("select_category", select_category),
+        ("select_type", select_type),
+        ("select_year_range", select_year_range),
+        ("next_page", next_page),
+    ]:
+        # Subtract the page load so the number is the action itself
+        results[f"ui.{name}"] = max(0.0, measure(action, repeat=3) - results["ui.home_load"])
+
+
+def run():
+    results = {"ui.driver_startup": measure(lambda: quit_driver(create_driver()), repeat=3)}
+    driver = create_driver()
+    try:
+        _bench_extraction(driver, results)
+        if FixtureStore().load("/"):
+            _bench_actions(driver, results)
+        else:
+            print("Skipping HomePage action benchmarks: no recorded site in the stand-in fixtures "
+                  "(run the suite once with TMDB_STUB=record)")
+    finally:
+        quit_driver(driver)
+    return results
@@ -0,0 +1,69 @@
+import json
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BENCH_DIR, "history.json")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.20
+
+
+def measure(fn, repeat=5, warmup=1):
+    """Run fn repeat times (after warmup runs) and return the median wall time in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCH_DIR, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _load(file_path, default):
+    if not os.path.exists(file_path):
+        return default
+    with open(file_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dump(file_path, data):
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def append_history(results):
+    history = _load(HISTORY_FILE, [])
+    history.append({
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "results": results,
+    })
+    _dump(HISTORY_FILE, history)
+
+
+def save_baseline(results):
+    _dump(BASELINE_FILE, results)
+
+
+# Return (name, baseline, current, change) for every metric slower than baseline by more than threshold
+def find_regressions(results, threshold=DEFAULT_THRESHOLD):
+    baseline = _load(BASELINE_FILE, {})
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current > previous * (1 + threshold):
+            regressions.append((name, previous, current, current / previous - 1))
+    return regressions
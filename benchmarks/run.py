@@ -0,0 +1,59 @@
+"""Performance benchmarks against the local TMDB stand-in.
+
+    python -m benchmarks.run                  # run everything, append to benchmarks/history.json
+    python -m benchmarks.run --suite api      # only the API client benchmarks
+    python -m benchmarks.run --suite startup  # import and collection time (no browser needed)
+    python -m benchmarks.run --compare        # fail when a metric regressed beyond --threshold vs baseline
+    python -m benchmarks.run --save-baseline  # store this run as benchmarks/baseline.json
+"""
+import argparse
+import os
+import sys
+
+# Benchmarks never touch the live services
+os.environ.setdefault("TMDB_STUB", "replay")
+
+from benchmarks.common import DEFAULT_THRESHOLD, append_history, find_regressions, save_baseline  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", choices=["all", "api", "ui", "startup"], default="all")
+    parser.add_argument("--compare", action="store_true", help="compare against benchmarks/baseline.json")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    from utils.stub_server import StubServer
+    server = StubServer(mode="replay").start()
+    results = {}
+    try:
+        if args.suite in ("all", "api"):
+            from benchmarks import bench_api
+            results.update(bench_api.run())
+        if args.suite in ("all", "ui"):
+            from benchmarks import bench_ui
+            results.update(bench_ui.run())
+        if args.suite in ("all", "startup"):
+            from benchmarks import bench_startup
+            results.update(bench_startup.run())
+    finally:
+        server.stop()
+
+    for name, seconds in sorted(results.items()):
+        print(f"{name:55s} {seconds * 1000:10.1f} ms")
+    append_history(results)
+    if args.save_baseline:
+        save_baseline(results)
+
+    if args.compare:
+        regressions = find_regressions(results, args.threshold)
+        for name, baseline, current, change in regressions:
+            print(f"REGRESSION {name}: {baseline * 1000:.1f} ms -> {current * 1000:.1f} ms (+{change:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,120 @@
 import pytest
-import os
-from utils.config import BASE_URL
-from selenium import webdriver
-from datetime import datetime
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from pytest_html import extras
+from utils.config import BASE_URL, DRIVER_MODE, TMDB_STUB
+from utils.artifacts import ArtifactStore
+from utils.logger import get_logger, merge_worker_logs, pipeline as log_pipeline
+from utils.stub_server import StubServer
+from utils.response_cache import build_response_cache
+from utils.tmdb_client import TMDBClient
+from utils.worker import is_worker
+# Browser modules (selenium, pages.*, utils.driver_*) are imported inside the fixtures that need them,
+# so API-only runs (`pytest -m api`) never load them
+
+pytest_plugins = ["utils.timing_plugin", "utils.cache_plugin", "utils.impact", "utils.duration_scheduler", "utils.flaky", "utils.marker_collect"]
+
+logger = get_logger(__name__)
+# Failure screenshots, DOM and console, written in the background and linked from the report
+artifact_store = ArtifactStore()
+
+
+# Local TMDB stand-in; BASE_URL and TMDB_API_URL already point at it when TMDB_STUB is on
+@pytest.fixture(scope="session", autouse=True)
+def tmdb_stub():
+    if TMDB_STUB == "off":
+        yield None
+        return
+
+    server = StubServer(mode=TMDB_STUB).start()
+
+    yield server
+
+    server.stop()
+
+
+# One pool of warm browsers per session (per worker when run in parallel)
+@pytest.fixture(scope="session")
+def driver_pool():
+    from utils.driver_pool import DriverPool
+
+    pool = DriverPool()
+
+    yield pool
+
+    pool.close()
 
 
 @pytest.fixture(scope="function")
 def driver(request):
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.maximize_window()
-    driver.implicitly_wait(5)
-    driver.get(BASE_URL)
+    from pages.locators import stats as locator_stats
+
+    locator_stats.reset()
+    request.addfinalizer(lambda: _report_locator_stats(request.node, locator_stats))
+
+    if DRIVER_MODE == "fresh":
+        from utils.driver_factory import create_driver, quit_driver
+
+        driver = create_driver()
+        driver.get(BASE_URL)
+
+        yield driver
+
+        quit_driver(driver)
+        return
+
+    pool = request.getfixturevalue("driver_pool")
+    driver = pool.acquire()
 
     yield driver
 
-    driver.quit()
+    pool.release(driver)
+
+
+# Per-test locator lookup counts/time, attached to the report and the log
+def _report_locator_stats(item, locator_stats):
+    lines = locator_stats.summary()
+    if lines:
+        item.add_report_section("teardown", "locators", "\n".join(lines))
+        logger.info(f"Locator lookups for {item.name}: " + "; ".join(lines))
+
+
+# App states captured by HomePage.reach_state, shared by every test in the session (per worker)
+@pytest.fixture(scope="session")
+def checkpoints():
+    return {}
+
+
+# Shared keep-alive API client for the whole session; repeated GETs come from the response cache
+@pytest.fixture(scope="session")
+def tmdb_client(request):
+    # Imported here: the plugin module must not be imported before pytest_plugins registers it
+    from utils.cache_plugin import track_session_cache
+
+    client = TMDBClient(cache=build_response_cache())
+    track_session_cache(request.config, client.cache)
+
+    yield client
+
+    client.close()
+
+
+def pytest_configure(config):
+    # log_cli already echoes records live; a second console handler would print everything twice
+    if config.getini("log_cli"):
+        log_pipeline.set_console(False)
+
+
+def pytest_sessionfinish(session):
+    artifact_store.close()
+    if not is_worker():
+        merge_worker_logs()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    log_pipeline.begin_test()
+
+
+def pytest_runtest_logfinish(nodeid):
+    log_pipeline.end_test()
 
 
 # Hook to track test result
@@ -26,25 +123,17 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
 
+    if report.failed:
+        log_pipeline.test_failed()
+
     if report.when == "call" and report.failed:
         driver = item.funcargs.get("driver", None)
         if driver:
-            # Create folder: reports/screenshots
-            screenshot_dir = "reports/screenshots"
-            os.makedirs(screenshot_dir, exist_ok=True)
-
-            # Save screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f"{item.name}_{timestamp}.png"
-            file_path = os.path.join(screenshot_dir, file_name)
-            driver.save_screenshot(file_path)
+            from pytest_html import extras
 
-            # Attach to HTML report 
-            relative_path = f"screenshots/{file_name}"
-
-            # Adding screenshot to pytest-html report
+            # Links, not inlined images: the report stays small however many tests fail
+            links = [extras.url(path, name=label) for label, path in artifact_store.capture(driver, item.name)]
             if hasattr(report, "extra"):
-                report.extra.append(extras.image(relative_path, mime_type="image/png"))
+                report.extra.extend(links)
             else:
-                report.extra = [extras.image(relative_path, mime_type="image/png")]
-
+                report.extra = links
@@ -0,0 +1,60 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.config import EXPLICIT_WAIT, READINESS_POLL_INTERVAL, NETWORK_IDLE_MS, DOM_QUIET_MS
+from utils.instrumentation import timings
+from utils.logger import get_logger
+from utils.readiness import READINESS_SCRIPT
+
+
+class BasePage:
+    def __init__(self, driver):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, EXPLICIT_WAIT)
+        self.logger = get_logger(self.__class__.__name__)
+
+    # Poll a condition at a tight interval and log how long the wait really took
+    def wait_until(self, condition, description, timeout=EXPLICIT_WAIT):
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=READINESS_POLL_INTERVAL).until(
+                condition, f"Timed out after {timeout}s waiting for {description}"
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            timings.record("wait", description, elapsed)
+            self.logger.info(f"Waited {elapsed * 1000:.0f} ms for {description}")
+        return result
+
+    # Probe state from the page; re-inject the probe when the document was loaded without it
+    def _readiness_state(self, watch_xpath=None):
+        return self.driver.execute_script(
+            """
+            if (!window.__readiness) { eval(arguments[0]); }
+            var state = window.__readiness;
+            var watch = arguments[1];
+            if (watch && !(watch in state.watched)) { state.watched[watch] = Date.now(); }
+            return {
+              inflight: state.inflight,
+              sinceNetwork: Date.now() - state.lastNetwork,
+              sinceMutation: Date.now() - (watch ? state.watched[watch] : state.lastMutation),
+              readyState: document.readyState
+            };
+            """,
+            READINESS_SCRIPT,
+            watch_xpath,
+        )
+
+    # No fetch/XHR in flight for idle_ms
+    def wait_for_network_idle(self, idle_ms=NETWORK_IDLE_MS, timeout=EXPLICIT_WAIT):
+        def idle(driver):
+            state = self._readiness_state()
+            return state["readyState"] == "complete" and state["inflight"] == 0 and state["sinceNetwork"] >= idle_ms
+
+        return self.wait_until(idle, f"network idle ({idle_ms} ms)", timeout)
+
+    # No DOM mutation inside the element at root_xpath (or anywhere) for quiet_ms
+    def wait_for_dom_quiescence(self, root_xpath=None, quiet_ms=DOM_QUIET_MS, timeout=EXPLICIT_WAIT):
+        def quiet(driver):
+            return self._readiness_state(root_xpath)["sinceMutation"] >= quiet_ms
+
+        return self.wait_until(quiet, f"DOM quiescence ({quiet_ms} ms) on {root_xpath or 'document'}", timeout)
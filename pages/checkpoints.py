@@ -0,0 +1,52 @@
+from urllib.parse import urlsplit
+
+# Read location and both web storages in one round trip
+CAPTURE_SCRIPT = """
+function dump(storage) {
+  var items = {};
+  for (var i = 0; i < storage.length; i++) { var key = storage.key(i); items[key] = storage.getItem(key); }
+  return items;
+}
+return {url: window.location.href, local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# Replace both web storages for the current origin
+RESTORE_STORAGE_SCRIPT = """
+var pairs = [[window.localStorage, arguments[0]], [window.sessionStorage, arguments[1]]];
+pairs.forEach(function (pair) {
+  pair[0].clear();
+  Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); });
+});
+"""
+
+
+class StateCheckpoint:
+    """A reachable app state: URL, localStorage/sessionStorage and the filters that produced it."""
+
+    def __init__(self, url, local_storage, session_storage, filters):
+        self.url = url
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.filters = {name: value for name, value in filters.items() if value}
+
+    @property
+    def origin(self):
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    # Filters the page did not bring back on its own from URL/storage (`shown` is HomePage.read_filter_state())
+    def missing_filters(self, shown):
+        return {name: value for name, value in self.filters.items() if not _same(shown.get(name), value)}
+
+    def __repr__(self):
+        return f"StateCheckpoint({self.url}, {self.filters})"
+
+
+def _same(shown, wanted):
+    if isinstance(shown, str) and isinstance(wanted, str):
+        return shown.strip().casefold() == wanted.casefold()
+    return shown == wanted
+
+
+def checkpoint_key(**filters):
+    return tuple(sorted((name, value) for name, value in filters.items() if value))
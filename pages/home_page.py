@@ -1,47 +1,129 @@
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
-from utils.config import EXPLICIT_WAIT
 from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import BasePage
+from pages.checkpoints import CAPTURE_SCRIPT, RESTORE_STORAGE_SCRIPT, StateCheckpoint, checkpoint_key
+from pages.locators import ElementCache, locator, timed_find, xpath
+from utils.config import EXPLICIT_WAIT
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
-class HomePage:
+class HomePage(BasePage):
+    # Locators (resolved once through the registry in pages/locators.py)
+    CATEGORY_FILTER = locator("CATEGORY_FILTER")
+    RESULTS_GRID = locator("RESULTS_GRID")
+    MOVIE_CARDS = locator("MOVIE_CARDS")
+    MOVIE_TITLES = locator("MOVIE_TITLES")
+    MOVIE_META = locator("MOVIE_META")
+    TYPE_DROPDOWN = locator("TYPE_DROPDOWN")
+    SELECTED_TYPE = locator("SELECTED_TYPE")
+    GENRE_DROPDOWN = locator("GENRE_DROPDOWN")
+    SELECTED_GENRE = locator("SELECTED_GENRE")
+    YEAR_START_DROPDOWN = locator("YEAR_START_DROPDOWN")
+    YEAR_END_DROPDOWN = locator("YEAR_END_DROPDOWN")
+    RATING_STARS = locator("RATING_STAR", stars=4)
+    PAGINATION = locator("PAGINATION")
+    NEXT_BUTTON = locator("NEXT_BUTTON")
+    SELECTED_PAGE = locator("SELECTED_PAGE")
+
     def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, EXPLICIT_WAIT)
-        self.logger = get_logger(self.__class__.__name__)
-    # Locators
-    CATEGORY_FILTER = (By.XPATH, "//nav//ul/li/a")
-    MOVIE_TITLES = (By.XPATH, "//div[contains(@class,'flex flex-col items-center')]/p[1]")
-    MOVIE_META = (By.XPATH, "//div[contains(@class,'flex flex-col items-center')]/p[2]")
-    TYPE_DROPDOWN = (By.XPATH, "(//p[text()='Type']/following::div[contains(@class,'css-yk16xz-control')])[1]")
-    SELECTED_TYPE = (By.XPATH, "//div[contains(@class,'css-1uccc91-singleValue')]")
-    GENRE_DROPDOWN = (By.XPATH, "(//p[text()='Genre']/following::div[contains(@class,'css-yk16xz-control')])[1]")
-    SELECTED_GENRE = (By.XPATH, "//div[contains(@class,'css-12jo7m5')]")
-    YEAR_START_DROPDOWN = (By.XPATH, "(//div[contains(@class,'css-1hwfws3')])[3]")
-    YEAR_END_DROPDOWN = (By.XPATH, "(//div[contains(@class,'css-1hwfws3')])[4]")
-    RATING_STARS = (By.XPATH, "(//ul[contains(@class,'rc-rate')]//div[@role='radio' and @aria-posinset='4'])")
-    PAGINATION = (By.ID, "react-paginate")
-    NEXT_BUTTON = (By.XPATH, "//li[contains(@class,'next')]/a")
-    SELECTED_PAGE = (By.XPATH, "//li[@class='selected']/a")
+        super().__init__(driver)
+        # Stable handles survive across page objects on the same (pooled) driver
+        if not hasattr(driver, "element_cache"):
+            driver.element_cache = ElementCache()
+        self.elements = driver.element_cache
 
     # Actions
     def select_category(self, category_name):
         try:
             self.logger.info(f"Selecting category: {category_name}")
-            self.wait.until(EC.presence_of_all_elements_located(self.CATEGORY_FILTER))
-            self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//nav//ul/li/a[text()='{category_name}']"))).click()
+            timed_find(self.wait, "CATEGORY_FILTER", EC.presence_of_all_elements_located)
+            timed_find(self.wait, "CATEGORY_LINK", EC.element_to_be_clickable, name=category_name).click()
             self.logger.info(f"Clicked on category: {category_name}")
         except Exception as e:
             self.logger.error(f"Error selecting category '{category_name}': {e}")
             raise
 
+    # Readiness: results are fetched and the grid has stopped re-rendering
+    def wait_for_results(self, timeout=EXPLICIT_WAIT):
+        self.wait_for_network_idle(timeout=timeout)
+        self.wait_for_dom_quiescence(xpath("RESULTS_GRID"), timeout=timeout)
+
+    # Read every card's title and meta line in a single execute_script round trip
+    def snapshot_results(self):
+        cards = self.driver.execute_script(
+            """
+            var nodes = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var cards = [];
+            for (var i = 0; i < nodes.snapshotLength; i++) {
+              var lines = nodes.snapshotItem(i).querySelectorAll(':scope > p');
+              cards.push({
+                title: lines[0] ? lines[0].innerText.trim() : '',
+                meta: lines[1] ? lines[1].innerText.trim() : ''
+              });
+            }
+            return cards;
+            """,
+            xpath("MOVIE_CARDS"),
+        )
+        # Meta line reads "<genre>, <year>"
+        for card in cards:
+            meta = card["meta"]
+            card["genre"] = meta.split(",")[0].strip() if meta else None
+            card["year"] = meta.split(",")[-1].strip() if "," in meta else None
+        return cards
+
+    # Network capture (driver.network, None when NETWORK_CAPTURE is off): results as the app fetched them
+    @property
+    def network(self):
+        return getattr(self.driver, "network", None)
+
+    # Marker for wait_for_api_results(): only responses captured after this call count
+    def network_mark(self):
+        return self.network.mark() if self.network else 0
+
+    # Wait until a list/discover response newer than `since` has landed and no other one is still loading;
+    # `matching(response)` narrows it to the request for the final filter state
+    def wait_for_api_results(self, since=0, timeout=EXPLICIT_WAIT, matching=None):
+        if not self.network:
+            return None
+
+        def landed(driver):
+            response = self.network.latest(since, matching)
+            return response if response and not self.network.in_flight else None
+
+        response = self.wait_until(landed, "captured API results", timeout)
+        self.logger.info(f"Captured {response!r} with {len(response.payload.get('results', []))} results")
+        return response
+
+    # Structured results (id, title, release_date, year, vote_average, genre_ids) of the latest captured response
+    def get_api_results(self, since=0, timeout=EXPLICIT_WAIT, matching=None):
+        try:
+            response = self.wait_for_api_results(since, timeout, matching)
+            return response.movies() if response else None
+        except Exception as e:
+            self.logger.error(f"Error reading captured results: {e}")
+            raise
+
+    # Cheap fingerprint of the grid to detect result changes
+    def results_signature(self):
+        return tuple(card["title"] for card in self.snapshot_results())
+
+    # Wait until the grid shows something other than `previous` (a results_signature()) and settles
+    def wait_for_results_changed(self, previous, timeout=EXPLICIT_WAIT):
+        self.wait_until(
+            lambda driver: (self.results_signature() or previous) != previous,
+            "results to change",
+            timeout,
+        )
+        self.wait_for_dom_quiescence(xpath("RESULTS_GRID"), timeout=timeout)
+
     # Return all visible movie titles
     def get_all_titles(self):
 
         try:
-            elements = self.wait.until(EC.presence_of_all_elements_located(self.MOVIE_TITLES))
-            titles = [el.text.strip() for el in elements if el.text.strip()]
+            cards = self.wait_until(lambda driver: self.snapshot_results(), "movie cards")
+            titles = [card["title"] for card in cards if card["title"]]
             self.logger.info(f"Found {len(titles)} movie titles: {titles[:5]} ...")
             return titles
         except Exception as e:
@@ -50,14 +132,18 @@ class HomePage:
             
     # After clicking the category UI changes to white from blue
     def get_category_color(self, category_name):
-        element = self.driver.find_element(By.XPATH, f"//li[a[text()='{category_name}']]")
+        element = timed_find(self.wait, "CATEGORY_ITEM", EC.presence_of_element_located, name=category_name)
         return element.get_attribute("class")
 
+    # Click an option in the currently open react-select menu
+    def _choose_option(self, text):
+        timed_find(self.wait, "DROPDOWN_OPTION", EC.element_to_be_clickable, text=text).click()
+
     # Select from Type dropdown (Movie/TV Shows)
     def select_type(self, type_name):
         try:
-            self.wait.until(EC.element_to_be_clickable(self.TYPE_DROPDOWN)).click()
-            self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//div[text()='{type_name}']"))).click()
+            self.elements.act(self.wait, "TYPE_DROPDOWN", EC.element_to_be_clickable, lambda el: el.click())
+            self._choose_option(type_name)
             self.logger.info(f"Selected type: {type_name}")
         except Exception as e:
             self.logger.error(f"Error selecting type '{type_name}': {e}")
@@ -66,7 +152,7 @@ class HomePage:
     # Get currently selected type value
     def get_selected_type(self):
         try:
-            selected = self.wait.until(EC.visibility_of_element_located(self.SELECTED_TYPE)).text
+            selected = timed_find(self.wait, "SELECTED_TYPE", EC.visibility_of_element_located).text
             self.logger.info(f"Currently selected type: {selected}")
             return selected
         except Exception as e:
@@ -75,10 +161,10 @@ class HomePage:
     # Select start and end year
     def select_year_range(self, start_year, end_year):
         try:
-            self.wait.until(EC.element_to_be_clickable(self.YEAR_START_DROPDOWN)).click()
-            self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//div[text()='{start_year}']"))).click()
-            self.wait.until(EC.element_to_be_clickable(self.YEAR_END_DROPDOWN)).click()
-            self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//div[text()='{end_year}']"))).click()
+            self.elements.act(self.wait, "YEAR_START_DROPDOWN", EC.element_to_be_clickable, lambda el: el.click())
+            self._choose_option(start_year)
+            self.elements.act(self.wait, "YEAR_END_DROPDOWN", EC.element_to_be_clickable, lambda el: el.click())
+            self._choose_option(end_year)
             self.logger.info(f"Year range selected: {start_year}-{end_year}")
         except Exception as e:
             self.logger.error(f"Error selecting year range: {e}")
@@ -86,7 +172,9 @@ class HomePage:
 
     def get_selected_start_year(self):
         try:
-            year_text = self.wait.until(EC.visibility_of_element_located(self.YEAR_START_DROPDOWN)).text
+            year_text = self.elements.act(
+                self.wait, "YEAR_START_DROPDOWN", EC.visibility_of_element_located, lambda el: el.text
+            )
             year = int(year_text)
             self.logger.info(f"Selected start year: {year}")
             return year
@@ -96,7 +184,9 @@ class HomePage:
 
     def get_selected_end_year(self):
         try:
-            year_text = self.wait.until(EC.visibility_of_element_located(self.YEAR_END_DROPDOWN)).text
+            year_text = self.elements.act(
+                self.wait, "YEAR_END_DROPDOWN", EC.visibility_of_element_located, lambda el: el.text
+            )
             year = int(year_text)
             self.logger.info(f"Selected end year: {year}")
             return year
@@ -104,11 +194,21 @@ class HomePage:
             self.logger.error(f"Error getting selected end year: {e}")
             return None
 
-    # Extract years from movie info
-    def get_displayed_years(self):
+    # Years of the current results. Given `since` (a network_mark() taken before the filter action) they are
+    # the exact release years of the response captured after it; without capture, or when no response
+    # arrives, they are parsed from each card's meta line
+    def get_displayed_years(self, since=None, matching=None):
         try:
-            items = self.driver.find_elements(*self.MOVIE_META)
-            years = [i.text.split(",")[-1].strip() for i in items if "," in i.text]
+            movies = None
+            if since is not None:
+                try:
+                    movies = self.get_api_results(since, matching=matching)
+                except TimeoutException:
+                    self.logger.warning("No captured results arrived; reading years from the grid")
+            if movies is not None:
+                years = [str(movie["year"]) for movie in movies if movie["year"] is not None]
+            else:
+                years = [card["year"] for card in self.snapshot_results() if card["year"] is not None]
             self.logger.info(f"Extracted years: {years[:5]} ...")
             return years
         except Exception as e:
@@ -119,13 +219,10 @@ class HomePage:
     def select_genre(self, genre_name):
         try:
             # Open dropdown
-            self.wait.until(EC.element_to_be_clickable(self.GENRE_DROPDOWN)).click()
+            self.elements.act(self.wait, "GENRE_DROPDOWN", EC.element_to_be_clickable, lambda el: el.click())
 
             # Click the desired genre
-            option = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//div[text()='{genre_name}']"))
-            )
-            option.click()
+            self._choose_option(genre_name)
             self.logger.info(f"Selected genre: {genre_name}")
 
         except Exception as e:
@@ -135,8 +232,7 @@ class HomePage:
     # getting genres of each movie displayed on the page
     def get_displayed_genres(self):
         try:
-            elements = self.driver.find_elements(*self.MOVIE_META)
-            genres = [el.text.split(",")[0].strip() for el in elements if el.text.strip()]
+            genres = [card["genre"] for card in self.snapshot_results() if card["genre"] is not None]
             self.logger.info(f"Extracted genres: {genres[:5]} ...")
             return genres
         except Exception as e:
@@ -145,10 +241,7 @@ class HomePage:
     # Click a specific star rating
     def select_rating(self, stars):
         try:
-            star = self.wait.until(EC.presence_of_element_located((
-                By.XPATH,
-                f"(//ul[contains(@class,'rc-rate')]//div[@role='radio' and @aria-posinset='{stars}'])"
-            )))
+            star = timed_find(self.wait, "RATING_STAR", EC.presence_of_element_located, stars=stars)
             star.click()
             self.logger.info(f"Selected rating: {stars} stars")
             return star
@@ -156,10 +249,96 @@ class HomePage:
             self.logger.error(f"Error selecting rating '{stars}': {e}")
             raise
 
+    # Apply any combination of filters in the order a user would, then wait for the grid to settle
+    def apply_filters(self, category=None, type_name=None, genre=None, year_range=None, stars=None):
+        try:
+            if category:
+                self.select_category(category)
+            if type_name:
+                self.select_type(type_name)
+            if genre:
+                self.select_genre(genre)
+            if year_range:
+                self.select_year_range(*year_range)
+            if stars:
+                self.select_rating(stars)
+            self.wait_for_results()
+        except Exception as e:
+            self.logger.error(f"Error applying filters: {e}")
+            raise
+
+    # What every filter currently shows, read in one round trip (None where nothing is selected)
+    def read_filter_state(self, category=None):
+        state = self.driver.execute_script(
+            """
+            function node(xp) {
+              return document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            }
+            function text(xp) { var n = node(xp); return n ? n.textContent.trim() : null; }
+            var stars = null;
+            arguments[4].forEach(function (xp, i) {
+              var n = node(xp);
+              if (n && n.getAttribute('aria-checked') === 'true') { stars = i + 1; }
+            });
+            var item = arguments[5] ? node(arguments[5]) : null;
+            return {
+              type_name: text(arguments[0]), genre: text(arguments[1]),
+              start: text(arguments[2]), end: text(arguments[3]),
+              stars: stars, category_selected: !!item && item.className.indexOf('white') !== -1
+            };
+            """,
+            xpath("SELECTED_TYPE"),
+            xpath("SELECTED_GENRE"),
+            xpath("YEAR_START_DROPDOWN"),
+            xpath("YEAR_END_DROPDOWN"),
+            [xpath("RATING_STAR", stars=stars) for stars in range(1, 6)],
+            xpath("CATEGORY_ITEM", name=category) if category else None,
+        )
+        years = (state.pop("start"), state.pop("end"))
+        state["year_range"] = tuple(int(year) for year in years) if all(y and y.isdigit() for y in years) else None
+        state["category"] = category if state.pop("category_selected") else None
+        return state
+
+    # Snapshot URL, web storage and the filters applied to get here
+    def capture_state(self, **filters):
+        state = self.driver.execute_script(CAPTURE_SCRIPT)
+        checkpoint = StateCheckpoint(state["url"], state["local"], state["session"], filters)
+        self.logger.info(f"Captured {checkpoint!r}")
+        return checkpoint
+
+    # Jump straight to a checkpoint: inject storage, load its URL, then re-apply only the filters that did not survive
+    def restore_state(self, checkpoint):
+        try:
+            if not self.driver.current_url.startswith(checkpoint.origin):
+                self.driver.get(checkpoint.origin)
+            self.driver.execute_script(RESTORE_STORAGE_SCRIPT, checkpoint.local_storage, checkpoint.session_storage)
+            self.driver.get(checkpoint.url)
+            self.elements.invalidate()
+            self.wait_for_results()
+
+            missing = checkpoint.missing_filters(self.read_filter_state(checkpoint.filters.get("category")))
+            if missing:
+                self.logger.info(f"Re-applying filters not kept by URL/storage: {missing}")
+                self.apply_filters(**missing)
+            self.logger.info(f"Restored {checkpoint!r}")
+        except Exception as e:
+            self.logger.error(f"Error restoring {checkpoint!r}: {e}")
+            raise
+
+    # Reach the state for `filters`: restore it from `checkpoints` when seen before, else click through and capture it
+    def reach_state(self, checkpoints, **filters):
+        key = checkpoint_key(**filters)
+        if key in checkpoints:
+            self.restore_state(checkpoints[key])
+            return True
+        self.apply_filters(**filters)
+        checkpoints[key] = self.capture_state(**filters)
+        return False
+
     # Wait until pagination component is visible
     def wait_for_pagination(self):
         try:
-            self.wait.until(EC.presence_of_element_located(self.PAGINATION))
+            self.elements.find(self.wait, "PAGINATION", EC.presence_of_element_located)
             self.logger.info("Pagination is visible.")
         except Exception as e:
             self.logger.error(f"Error waiting for pagination: {e}")
@@ -168,8 +347,7 @@ class HomePage:
     # Click on the next page button
     def click_next_page(self):
         try:
-            next_button = self.wait.until(EC.element_to_be_clickable(self.NEXT_BUTTON))
-            next_button.click()
+            self.elements.act(self.wait, "NEXT_BUTTON", EC.element_to_be_clickable, lambda el: el.click())
             self.logger.info("Clicked next page button.")
         except Exception as e:
             self.logger.error(f"Error clicking next page button: {e}")
@@ -178,9 +356,7 @@ class HomePage:
     # Return the number of the currently selected page
     def get_selected_page_number(self):
         try:
-            selected = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located(self.SELECTED_PAGE)
-            )
+            selected = timed_find(WebDriverWait(self.driver, 5), "SELECTED_PAGE", EC.presence_of_element_located)
             page_number = selected.text.strip()
             self.logger.info(f"Currently selected page: {page_number}")
             return page_number
@@ -189,11 +365,38 @@ class HomePage:
             return None
     def select_page(self, page_number):
         try:
-            page_link = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, f"//li/a[text()='{page_number}']")))
+            page_link = timed_find(WebDriverWait(self.driver, 5), "PAGE_LINK", EC.element_to_be_clickable, number=page_number)
             page_link.click()
             self.logger.info(f"Selected page: {page_number}")
         except Exception as e:
             self.logger.error(f"Error selecting page: {e}")
 
+    # All page numbers currently rendered in the paginator, in one round trip
+    def get_visible_page_numbers(self):
+        labels = self.driver.execute_script(
+            """
+            var nodes = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var labels = [];
+            for (var i = 0; i < nodes.snapshotLength; i++) { labels.push(nodes.snapshotItem(i).textContent.trim()); }
+            return labels;
+            """,
+            xpath("PAGE_NUMBER_LINKS"),
+        )
+        return sorted(int(label) for label in labels if label.isdigit())
 
+    # Walk the paginator to page_number, jumping to the closest visible link each time
+    def go_to_page(self, page_number, max_jumps=50):
+        current = int(self.get_selected_page_number() or 1)
+        for _ in range(max_jumps):
+            if current == page_number:
+                return
+            visible = self.get_visible_page_numbers()
+            target = page_number if page_number in visible else min(visible, key=lambda n: abs(n - page_number))
+            if target == current:
+                raise RuntimeError(f"Page {page_number} is not reachable from page {current}")
+            previous = self.results_signature()
+            self.select_page(target)
+            self.wait_for_results_changed(previous)
+            current = target
+            self.logger.info(f"Moved to page {current} on the way to {page_number}")
+        raise RuntimeError(f"Page {page_number} not reached within {max_jumps} jumps")
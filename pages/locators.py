@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from utils.config import USE_CSS_LOCATORS
+
+# name: (xpath, css or None). "{placeholders}" make a locator parameterized.
+# XPath is the source of truth; CSS equivalents are used when the browser can evaluate them natively.
+LOCATORS = {
+    "CATEGORY_FILTER": ("//nav//ul/li/a", "nav ul > li > a"),
+    "CATEGORY_LINK": ("//nav//ul/li/a[text()='{name}']", None),
+    "CATEGORY_ITEM": ("//li[a[text()='{name}']]", None),
+    "RESULTS_GRID": ("(//div[contains(@class,'flex flex-col items-center')]/..)[1]", None),
+    "MOVIE_CARDS": ("//div[contains(@class,'flex flex-col items-center')]", "div.flex.flex-col.items-center"),
+    "MOVIE_TITLES": (
+        "//div[contains(@class,'flex flex-col items-center')]/p[1]",
+        "div.flex.flex-col.items-center > p:nth-of-type(1)",
+    ),
+    "MOVIE_META": (
+        "//div[contains(@class,'flex flex-col items-center')]/p[2]",
+        "div.flex.flex-col.items-center > p:nth-of-type(2)",
+    ),
+    "TYPE_DROPDOWN": ("(//p[text()='Type']/following::div[contains(@class,'css-yk16xz-control')])[1]", None),
+    "SELECTED_TYPE": ("//div[contains(@class,'css-1uccc91-singleValue')]", "div[class*='css-1uccc91-singleValue']"),
+    "GENRE_DROPDOWN": ("(//p[text()='Genre']/following::div[contains(@class,'css-yk16xz-control')])[1]", None),
+    "SELECTED_GENRE": ("//div[contains(@class,'css-12jo7m5')]", "div[class*='css-12jo7m5']"),
+    "YEAR_START_DROPDOWN": ("(//div[contains(@class,'css-1hwfws3')])[3]", None),
+    "YEAR_END_DROPDOWN": ("(//div[contains(@class,'css-1hwfws3')])[4]", None),
+    "DROPDOWN_OPTION": ("//div[text()='{text}']", None),
+    "RATING_STAR": (
+        "(//ul[contains(@class,'rc-rate')]//div[@role='radio' and @aria-posinset='{stars}'])",
+        "ul[class*='rc-rate'] div[role='radio'][aria-posinset='{stars}']",
+    ),
+    "PAGINATION": ("//*[@id='react-paginate']", "#react-paginate"),
+    "NEXT_BUTTON": ("//li[contains(@class,'next')]/a", "li[class*='next'] > a"),
+    "SELECTED_PAGE": ("//li[@class='selected']/a", "li[class='selected'] > a"),
+    "PAGE_LINK": ("//li/a[text()='{number}']", None),
+    "PAGE_NUMBER_LINKS": ("//*[@id='react-paginate']//li/a", "#react-paginate li a"),
+}
+
+
+# Build each (name, params) locator once; later calls are a dict lookup
+@lru_cache(maxsize=None)
+def _build(name, params):
+    xpath_value, css = LOCATORS[name]
+    values = dict(params)
+    if USE_CSS_LOCATORS and css:
+        return By.CSS_SELECTOR, css.format(**values)
+    return By.XPATH, xpath_value.format(**values)
+
+
+def locator(name, **params):
+    """Return the (By, value) tuple for a registered locator, preferring its CSS form."""
+    return _build(name, tuple(sorted(params.items())))
+
+
+def xpath(name, **params):
+    """Return the XPath form of a registered locator (for JavaScript-side document.evaluate)."""
+    return LOCATORS[name][0].format(**params)
+
+
+class LocatorStats:
+    """Lookup counts and time per locator name for the running test."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.lookups = defaultdict(lambda: {"count": 0, "cache_hits": 0, "seconds": 0.0})
+
+    def record(self, name, seconds, cache_hit=False):
+        with self._lock:
+            entry = self.lookups[name]
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["cache_hits"] += int(cache_hit)
+
+    def summary(self):
+        with self._lock:
+            rows = sorted(self.lookups.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        return [
+            f"{name}: {entry['count']} lookups, {entry['cache_hits']} cached, {entry['seconds'] * 1000:.0f} ms"
+            for name, entry in rows
+        ]
+
+
+stats = LocatorStats()
+
+
+def _attached(element):
+    # Any call on a handle the page has re-rendered away raises StaleElementReferenceException
+    def check(driver):
+        element.is_enabled()
+        return element
+    return check
+
+
+# Locator-based condition -> the same condition on an already resolved element
+ELEMENT_CONDITIONS = {
+    EC.presence_of_element_located: _attached,
+    EC.visibility_of_element_located: EC.visibility_of,
+    EC.element_to_be_clickable: EC.element_to_be_clickable,
+}
+
+
+class ElementCache:
+    """Resolved handles for stable elements, dropped as soon as they go stale.
+
+    A cached handle skips the locator search, not the wait: the caller's condition (visible, clickable)
+    is still awaited on it. Conditions without an element form are never served from the cache.
+    """
+
+    def __init__(self):
+        self._handles = {}
+
+    def find(self, wait, name, condition, **params):
+        key = (name, tuple(sorted(params.items())))
+        handle = self._handles.get(key)
+        on_element = ELEMENT_CONDITIONS.get(condition)
+        if handle is not None and on_element is not None:
+            start = time.perf_counter()
+            try:
+                handle = wait.until(on_element(handle))
+                stats.record(name, time.perf_counter() - start, cache_hit=True)
+                return handle
+            except StaleElementReferenceException:
+                del self._handles[key]
+
+        start = time.perf_counter()
+        try:
+            handle = wait.until(condition(locator(name, **params)))
+        finally:
+            stats.record(name, time.perf_counter() - start)
+        if on_element is not None:
+            self._handles[key] = handle
+        return handle
+
+    # Run action(element); on a stale handle, re-resolve once and retry
+    def act(self, wait, name, condition, action, **params):
+        try:
+            return action(self.find(wait, name, condition, **params))
+        except StaleElementReferenceException:
+            self.invalidate()
+            return action(self.find(wait, name, condition, **params))
+
+    def invalidate(self):
+        self._handles.clear()
+
+
+# Locate an element that is not worth caching (parameterized options, one-off lookups) and record it
+def timed_find(wait, name, condition, **params):
+    start = time.perf_counter()
+    try:
+        return wait.until(condition(locator(name, **params)))
+    finally:
+        stats.record(name, time.perf_counter() - start)
@@ -0,0 +1,45 @@
+import pytest
+import requests
+from utils import request_scheduler, response_cache
+
+# Shared fakes for the helper unit tests (no browser, no network)
+
+
+class FakeClock:
+    """Stands in for the `time` module of utils.request_scheduler and utils.response_cache."""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    # Like a real sleep, always lets some time pass (a sub-ULP delay would otherwise never move the clock)
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += max(seconds, 1e-6)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(request_scheduler, "time", fake)
+    monkeypatch.setattr(response_cache, "time", fake)
+    return fake
+
+
+# Builds a requests.Response without a server: make_response(429, **{"Retry-After": "2"})
+@pytest.fixture
+def make_response():
+    def build(status, body=b"", url="http://tmdb.test/3/movie/popular", **headers):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body
+        response.url = url
+        return response
+    return build
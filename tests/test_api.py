@@ -1,35 +1,63 @@
-import requests
 import pytest
+from utils.config import TMDB_STUB
 from utils.logger import get_logger
+from utils.pagination_crawler import crawl_api
+from utils.schema import PageValidator, discover_validator
 
 
 logger = get_logger()
+
+pytestmark = pytest.mark.api
+
 # API Details
-BASE_URL = "https://api.themoviedb.org/3/movie"
-API_KEY = "add494e96808c55b3ee7f940c9d5e5b6"
 CATEGORIES = ["popular", "top_rated", "now_playing"]
+YEAR_RANGES = [(2000, 2010), (2015, 2025)]
+PAGES = [1, 2, 3, 4]
 START_YEAR = 1900
 END_YEAR = 2025
-PAGE_NUMBER = 2
-params = {
-    "sort_by": "popularity.desc",
-    "release_date.gte": f"{START_YEAR}-01-01",
-    "release_date.lte": f"{END_YEAR}-12-31",
-    "vote_average.gte": 5,
-    "vote_average.lte": 5,
-    "page": f"{PAGE_NUMBER}",
-    "api_key": API_KEY
+RATING_FILTER = {
+    "release_date_gte": f"{START_YEAR}-01-01",
+    "release_date_lte": f"{END_YEAR}-12-31",
+    "vote_average_gte": 5,
+    "vote_average_lte": 5,
 }
 
+
+# Prefetch every parametrized case concurrently, so the module costs one round trip
+@pytest.fixture(scope="module")
+def category_responses(tmdb_client):
+    responses = tmdb_client.run_concurrently(
+        [lambda category=category: tmdb_client.get_movie_list(category) for category in CATEGORIES]
+    )
+    return dict(zip(CATEGORIES, responses))
+
+
+@pytest.fixture(scope="module")
+def year_range_responses(tmdb_client):
+    responses = tmdb_client.run_concurrently([
+        lambda start=start, end=end: tmdb_client.discover_movies(
+            release_date_gte=f"{start}-01-01",
+            release_date_lte=f"{end}-12-31",
+            vote_average_gte=0,
+            vote_average_lte=5,
+        )
+        for start, end in YEAR_RANGES
+    ])
+    return dict(zip(YEAR_RANGES, responses))
+
+
+@pytest.fixture(scope="module")
+def popular_pages(tmdb_client):
+    return tmdb_client.get_movie_list_pages("popular", PAGES)
+
+
 # API Test: Category
 @pytest.mark.parametrize("category", CATEGORIES)
-def test_api_category(category):
-    url = f"{BASE_URL}/{category}?page=1&api_key={API_KEY}"
-
+def test_api_category(category, category_responses):
     try:
         logger.info(f"==== Starting API Test for Category: {category} ====")
-        logger.info(f"Step 1: Sending GET request to {url}")
-        response = requests.get(url)
+        response = category_responses[category]
+        logger.info(f"Step 1: Sent GET request to {response.url}")
         logger.info(f"Response Code: {response.status_code}")
 
         assert response.status_code == 200, f"Failed API call for {category}"
@@ -44,14 +72,9 @@ def test_api_category(category):
         logger.info(f"Step 4: Number of movies returned: {len(movies)}")
         assert len(movies) > 0, "No movies found in response"
 
-        logger.info("Step 5: Validating fields for first 5 movies")
-        for i, movie in enumerate(movies[:5]):
-            title = movie.get("title")
-            logger.info(f"Validating Movie {i+1}: {title}")
-            assert "title" in movie, "'title' missing"
-            assert "release_date" in movie, "'release_date' missing"
-            assert "vote_average" in movie, "'vote_average' missing"
-            assert "id" in movie, "'id' missing"
+        logger.info("Step 5: Validating every movie against the list schema")
+        report = PageValidator().validate_page(data)
+        assert report.ok, report.summary()
 
         logger.info(f"==== API Test Passed for '{category}' ====")
 
@@ -64,39 +87,20 @@ def test_api_category(category):
 
 
 #  API Test: Rating Filter
-def test_api_rating():
-    params = {
-        "sort_by": "popularity.desc",
-        "release_date.gte": "1900-01-01",
-        "release_date.lte": "2025-12-31",
-        "vote_average.gte": 5,
-        "vote_average.lte": 5,
-        "page": 1,
-        "api_key": API_KEY
-    }
-
+def test_api_rating(tmdb_client):
     try:
         logger.info("==== Starting API Test for Rating Filter ====")
-        response = requests.get("https://api.themoviedb.org/3/discover/movie", params=params)
+        response = tmdb_client.discover_movies(**RATING_FILTER)
         logger.info(f"Request URL: {response.url}")
         logger.info(f"Response Status: {response.status_code}")
 
         assert response.status_code == 200, "API did not return 200 OK"
 
         data = response.json()
-        expected_keys = ["page", "results", "total_pages", "total_results"]
-
-        for key in expected_keys:
-            assert key in data, f"'{key}' not found in response"
+        logger.info(f"Total Movies Returned: {len(data.get('results', []))}")
 
-        results = data.get("results", [])
-        logger.info(f"Total Movies Returned: {len(results)}")
-
-        for movie in results:
-            title = movie.get("title", "N/A")
-            vote = movie.get("vote_average", 0)
-            logger.info(f"Movie: {title} | Vote: {vote}")
-            assert vote <= 5, f"{title} has vote_average > 5"
+        report = discover_validator(vote_max=5).validate_page(data)
+        assert report.ok, report.summary()
 
         logger.info("==== API Test Passed for Rating Filter ====\n")
 
@@ -109,33 +113,21 @@ def test_api_rating():
 
 
 # API Test: Year filter
-@pytest.mark.parametrize("start_year,end_year", [(2000, 2010), (2015, 2025)])
-def test_api_year_range(start_year, end_year):
-    yearparams = {
-        "sort_by": "popularity.desc",
-        "release_date.gte": f"{start_year}-01-01",
-        "release_date.lte": f"{end_year}-12-31",
-        "vote_average.gte": 0,
-        "vote_average.lte": 5,
-        "page": 1,
-        "api_key": API_KEY
-    }
-
+@pytest.mark.parametrize("start_year,end_year", YEAR_RANGES)
+def test_api_year_range(start_year, end_year, year_range_responses):
     try:
         logger.info(f"==== Starting Year Range Test: {start_year}-{end_year} ====")
-        response = requests.get("https://api.themoviedb.org/3/discover/movie", params=yearparams)
+        response = year_range_responses[(start_year, end_year)]
         logger.info(f"Request URL: {response.url}")
         logger.info(f"Response Status: {response.status_code}")
         assert response.status_code == 200, "did not return 200 OK"
 
         data = response.json()
-        results = data.get("results", [])
-        logger.info(f"Movies Found: {len(results)}")
+        logger.info(f"Movies Found: {len(data.get('results', []))}")
 
-        for movie in results:
-            release_date = movie.get("release_date", "0000-00-00")
-            release_year = int(release_date.split("-")[0])
-            assert start_year <= release_year <= end_year, f"({release_year}) is not in range"
+        # Empty or missing release dates are reported as violations rather than crashing the test
+        report = discover_validator(start_year, end_year).validate_page(data)
+        assert report.ok, report.summary()
 
         logger.info(f"==== API Year Range Test Passed for {start_year}-{end_year} ====\n")
 
@@ -147,15 +139,12 @@ def test_api_year_range(start_year, end_year):
         raise
 
 # API Test: Pagination
-@pytest.mark.parametrize("page_number", [1, 2, 3, 4])
-def test_api_pagination(page_number):
-    url = f"{BASE_URL}/popular?page={page_number}&api_key={API_KEY}"
-
+@pytest.mark.parametrize("page_number", PAGES)
+def test_api_pagination(page_number, popular_pages):
     try:
         logger.info(f"==== Starting Pagination Test for Page {page_number} ====")
-        logger.info(f"Step 1: Sending GET request → {url}")
-
-        response = requests.get(url)
+        response = popular_pages[page_number]
+        logger.info(f"Step 1: Sent GET request → {response.url}")
         logger.info(f"Step 2: Response Status Code → {response.status_code}")
         assert response.status_code == 200, f"did not return 200 OK {page_number}"
 
@@ -170,4 +159,36 @@ def test_api_pagination(page_number):
         raise
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+# API Test: crawl every popular page (up to CRAWL_PAGE_BUDGET) concurrently
+def test_api_pagination_crawl(tmdb_client, request):
+    try:
+        logger.info("==== Starting Pagination Crawl Test ====")
+        report = crawl_api(tmdb_client, "popular")
+        request.node.add_report_section("call", "crawl", report.summary())
+
+        logger.info(f"Step 1: Crawled {len(report.pages)} of {report.total_pages} pages")
+        assert len(report.pages) == report.total_pages, "Not every page was crawled"
+
+        logger.info("Step 2: Validating every page returned well-formed, non-empty results")
+        failures = {page: report.pages[page].errors for page in report.failed_pages}
+        assert not failures, f"Invalid pages: {failures}"
+
+        logger.info("Step 3: Checking no movie appears on more than one page")
+        if TMDB_STUB == "off":
+            # The live ranking shifts while the crawl runs, so movies can move between pages: report only
+            if report.duplicates:
+                logger.warning(f"Duplicate movies across pages (live ranking moved): {report.duplicates[:10]}")
+        else:
+            assert not report.duplicates, f"Duplicate movies across pages: {report.duplicates[:10]}"
+
+        logger.info("==== Pagination Crawl Test Passed ====\n")
+
+    except AssertionError as e:
+        logger.error(f"Assertion failed: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise
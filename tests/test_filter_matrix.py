@@ -0,0 +1,62 @@
+from itertools import combinations, product
+from utils.filter_matrix import FILTER_SPACE, covering_array, filter_matrix, is_valid
+
+SPACE = {
+    "a": [1, 2, 3],
+    "b": ["x", "y"],
+    "c": [True, False],
+    "d": ["p", "q", "r"],
+}
+
+
+# Every `strength`-wise value tuple that occurs in some row accepted by `valid`
+def required_tuples(space, strength, valid):
+    names = list(space)
+    rows = [dict(zip(names, row)) for row in product(*space.values())]
+    return {
+        tuple((name, row[name]) for name in group)
+        for row in rows if valid(row)
+        for group in combinations(names, strength)
+    }
+
+
+def covered_tuples(rows, strength):
+    return {tuple((name, row[name]) for name in group) for row in rows for group in combinations(row, strength)}
+
+
+def test_every_pair_is_covered_with_fewer_rows_than_the_cross_product():
+    rows = covering_array(SPACE, strength=2, valid=lambda row: True)
+
+    assert required_tuples(SPACE, 2, lambda row: True) <= covered_tuples(rows, 2)
+    # 3 x 3 pairs need at least 9 rows; the full cross product has 36
+    assert 9 <= len(rows) < 36
+
+
+def test_generation_is_deterministic():
+    assert covering_array(SPACE, strength=2) == covering_array(SPACE, strength=2)
+
+
+def test_strength_is_clamped_to_the_number_of_fields():
+    rows = covering_array(SPACE, strength=10, valid=lambda row: True)
+
+    assert len(rows) == 36
+
+
+def test_invalid_rows_are_pruned_and_their_tuples_not_required():
+    def valid(row):
+        return not (row["a"] == 3 and row["b"] == "y")
+
+    rows = covering_array(SPACE, strength=2, valid=valid)
+
+    assert all(valid(row) for row in rows)
+    assert ("a", 3) in {("a", row["a"]) for row in rows}
+    assert required_tuples(SPACE, 2, valid) <= covered_tuples(rows, 2)
+    assert (("a", 3), ("b", "y")) not in covered_tuples(rows, 2)
+
+
+def test_filter_matrix_covers_the_ui_filter_space():
+    filters = filter_matrix(strength=2)
+    rows = [{name: getattr(f, name) for name in FILTER_SPACE} for f in filters]
+
+    assert required_tuples(FILTER_SPACE, 2, is_valid) <= covered_tuples(rows, 2)
+    assert not any(row["type_name"] == "TV Shows" and row["genre"] == "Action" for row in rows)
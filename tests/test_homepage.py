@@ -5,12 +5,18 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.home_page import HomePage
-from utils.config import BASE_URL
-from utils.test_data import CATEGORY_DATA, TYPE_DATA, YEAR_RANGE_DATA, GENRE_NAME
-import time
+from pages.locators import locator
+from utils.config import BASE_URL, CRAWL_UI_CONCURRENCY, TMDB_STUB
+from utils.cross_check import CATEGORY_SORT, VOTES_PER_STAR, FilterSet, cross_check
+from utils.driver_pool import DriverPool
+from utils.filter_matrix import matrix_params
+from utils.pagination_crawler import crawl_ui
+from utils.test_data import CATEGORY_DATA, CROSS_CHECK_DATA, TYPE_DATA, YEAR_RANGE_DATA, GENRE_NAME
 
 logger = logging.getLogger(__name__)
 
+pytestmark = pytest.mark.ui
+
 # Verify filtering by categories and correct URL redirection
 @pytest.mark.parametrize("category,slug", CATEGORY_DATA.items())
 def test_category_filter(driver, category, slug):
@@ -57,10 +63,7 @@ def test_type_filter(driver, type_name):
 
         logger.info("Step 2: Waiting for dropdown value to update")
         WebDriverWait(driver, 10).until(
-            EC.text_to_be_present_in_element(
-                (By.XPATH, "//div[contains(@class,'css-1uccc91-singleValue')]"),
-                type_name
-            )
+            EC.text_to_be_present_in_element(home.SELECTED_TYPE, type_name)
         )
 
         logger.info("Step 3: Validating selected type from UI")
@@ -81,6 +84,7 @@ def test_year_range_filter(driver, start_year, end_year):
     logger.info("  Starting Year Range Filter Test  ")
     try:
         logger.info(f"Step 1: Selecting year range: start_year: {end_year}")
+        since = home.network_mark()
         home.select_year_range(start_year, end_year)
 
         logger.info("Step 2: Verifying selected years in UI")
@@ -91,11 +95,14 @@ def test_year_range_filter(driver, start_year, end_year):
         assert selected_start == start_year
         assert selected_end == end_year
 
-        # logger.info("Step 3: Verifying all displayed movies fall in range")
-        # years = home.get_displayed_years()
-        # for year in years:
-        #     assert start_year <= int(year) <= end_year, f"Movie year {year} not in range"
-        # logger.info(f"Displayed years: {years}")
+        # Exact release dates need network capture; the card text alone is too lossy to assert on.
+        # Picking the start year already fires a request: only the one carrying both years counts
+        movies = home.get_api_results(since, matching=FilterSet(year_range=(start_year, end_year)).matches_capture)
+        if movies is not None:
+            logger.info("Step 3: Verifying every fetched movie falls in range")
+            out_of_range = [movie for movie in movies if movie["year"] and not start_year <= movie["year"] <= end_year]
+            assert not out_of_range, f"Movies outside {start_year}-{end_year}: {out_of_range[:5]}"
+            logger.info(f"Fetched years: {sorted({movie['year'] for movie in movies if movie['year']})}")
 
         logger.info(f"  Year Range Filter Test Passed ({start_year}-{end_year})  ")
 
@@ -113,7 +120,7 @@ def test_star_rating(driver, star_count):
         home.select_rating(star_count)
 
         logger.info("Step 2: Waiting for selected star to be active")
-        selected_star_locator = (By.XPATH, f"(//ul[contains(@class,'rc-rate')]//div[@role='radio' and @aria-posinset='{star_count}'])")
+        selected_star_locator = locator("RATING_STAR", stars=star_count)
         WebDriverWait(driver, 10).until(
             EC.element_attribute_to_include(selected_star_locator, "aria-checked")
         )
@@ -198,8 +205,8 @@ def test_refresh_category(driver, slug_name, slug_url):
 
         # refreshing page and checking
         driver.refresh()
-        # waiting for elements to be located
-        time.sleep(5)
+        # waiting for the reload to finish fetching and rendering
+        home.wait_for_results()
         # Getting movie titles after refresh
         titles_after_refresh = home.get_all_titles()
         assert titles_after_refresh, f"No movie titles found after refreshing category page '{slug_name}'"
@@ -217,7 +224,7 @@ def test_broken_pages(driver):
     try:
         logger.info("Step 1: Waiting for pagination to be visible")
         WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "react-paginate"))
+            EC.presence_of_element_located(home.PAGINATION)
         )
 
         logger.info("Step 2: Fetching last 3 page numbers")
@@ -231,7 +238,9 @@ def test_broken_pages(driver):
 
         for page_num in last_three_pages:
             logger.info(f"Step 3: Clicking on page: {page_num}")
+            previous = home.results_signature()
             home.select_page(page_num)
+            home.wait_for_results_changed(previous)
 
             logger.info("Step 4: Verifying movie titles are present")
             titles = home.get_all_titles()
@@ -243,3 +252,115 @@ def test_broken_pages(driver):
     except (TimeoutException, NoSuchElementException, AssertionError) as e:
         logger.error(f"Broken Page Check Failed: {e}")
         raise
+
+
+# Pairwise-covering combinations of every filter (FILTER_MATRIX_STRENGTH), generated at collection time
+@pytest.mark.parametrize("filters", matrix_params())
+def test_filter_combination(driver, checkpoints, filters):
+    home = HomePage(driver)
+    logger.info(f"  Starting Filter Combination Test: {filters!r}  ")
+    try:
+        logger.info("Step 1: Reaching the category/type state (restored from a checkpoint when already seen)")
+        restored = home.reach_state(checkpoints, category=filters.category, type_name=filters.type_name)
+        logger.info(f"Prefix state {'restored' if restored else 'captured'}")
+
+        logger.info("Step 2: Applying the remaining filters")
+        since = home.network_mark()
+        home.apply_filters(genre=filters.genre, year_range=filters.year_range, stars=filters.stars)
+
+        logger.info("Step 3: Verifying each filter still shows its selected value")
+        assert home.get_selected_type().lower() == filters.type_name.lower(), "Type selection was lost"
+        selected_genre = WebDriverWait(driver, 10).until(EC.visibility_of_element_located(home.SELECTED_GENRE)).text
+        assert selected_genre.lower() == filters.genre.lower(), f"Genre shows '{selected_genre}'"
+        selected_years = (home.get_selected_start_year(), home.get_selected_end_year())
+        assert selected_years == filters.year_range, f"Year range shows {selected_years}"
+        star = driver.find_element(*locator("RATING_STAR", stars=filters.stars))
+        assert star.get_attribute("aria-checked") == "true", f"{filters.stars}-star rating not selected"
+
+        logger.info("Step 4: Verifying the grid renders for the combination")
+        assert home.get_all_titles(), f"No movie titles for {filters!r}"
+
+        # Only categories backed by /discover send the filters to the API (Trend does not)
+        if filters.category in CATEGORY_SORT:
+            # Genre is left out of the match: its TMDB id is not known here
+            final_query = FilterSet(category=filters.category, type_name=filters.type_name,
+                                    year_range=filters.year_range, stars=filters.stars)
+            movies = home.get_api_results(since, matching=final_query.matches_capture)
+        else:
+            movies = None
+        if movies is not None:
+            logger.info("Step 5: Verifying the fetched results honour the year range and rating")
+            start_year, end_year = filters.year_range
+            min_vote = filters.stars * VOTES_PER_STAR
+            violations = [
+                movie for movie in movies
+                if (movie["year"] and not start_year <= movie["year"] <= end_year)
+                or (movie["vote_average"] or 0) < min_vote
+            ]
+            assert not violations, f"Results outside {filters!r}: {violations[:5]}"
+
+        logger.info(f"  Filter Combination Test Passed: {filters!r}  ")
+
+    except (TimeoutException, NoSuchElementException, AssertionError) as e:
+        logger.error(f"Filter Combination Test Failed for {filters!r}: {e}")
+        raise
+
+
+# Several pooled browsers walk the paginator in parallel, validating every page up to the budget
+@pytest.fixture(scope="module")
+def crawl_pool():
+    pool = DriverPool(size=CRAWL_UI_CONCURRENCY)
+
+    yield pool
+
+    pool.close()
+
+
+def test_pagination_crawl(crawl_pool, request):
+    logger.info("  Starting Pagination Crawl Test  ")
+    try:
+        report = crawl_ui(crawl_pool, HomePage)
+        request.node.add_report_section("call", "crawl", report.summary())
+
+        logger.info(f"Step 1: Crawled {len(report.pages)} of {report.total_pages} pages")
+        assert len(report.pages) == report.total_pages, "Not every page was crawled"
+
+        logger.info("Step 2: Verifying every page shows movie titles")
+        failures = {page: report.pages[page].errors for page in report.failed_pages}
+        assert not failures, f"Broken pages: {failures}"
+
+        logger.info("Step 3: Verifying no movie is repeated across pages")
+        if TMDB_STUB == "off":
+            # The live ranking shifts while the crawl runs, so movies can move between pages: report only
+            if report.duplicates:
+                logger.warning(f"Movies repeated across pages (live ranking moved): {report.duplicates[:10]}")
+        else:
+            assert not report.duplicates, f"Movies repeated across pages: {report.duplicates[:10]}"
+
+        logger.info("  Pagination Crawl Test Passed  ")
+
+    except (TimeoutException, NoSuchElementException, AssertionError) as e:
+        logger.error(f"Pagination Crawl Test Failed: {e}")
+        raise
+
+
+# The grid must show exactly what /discover returns for the same filters (UI and API fetched concurrently)
+@pytest.mark.parametrize("filters", [FilterSet(**data) for data in CROSS_CHECK_DATA], ids=repr)
+def test_ui_matches_api(driver, tmdb_client, filters, request):
+    home = HomePage(driver)
+    logger.info(f"  Starting UI vs API Cross-Check: {filters!r}  ")
+    try:
+        logger.info("Step 1: Applying filters in the UI while fetching /discover")
+        result = cross_check(home, tmdb_client, filters)
+        request.node.add_report_section("call", "cross-check", result.summary())
+
+        logger.info(f"Step 2: Verifying the grid and the API agree ({len(result.matched)} matched)")
+        assert result.api, f"/discover returned no results for {filters!r}"
+        assert not result.only_ui, f"Shown in the grid but not returned by the API: {result.only_ui}"
+        assert not result.only_api, f"Returned by the API but missing from the grid: {result.only_api}"
+
+        logger.info(f"  UI vs API Cross-Check Passed: {filters!r}  ")
+
+    except (TimeoutException, NoSuchElementException, AssertionError) as e:
+        logger.error(f"UI vs API Cross-Check Failed for {filters!r}: {e}")
+        raise
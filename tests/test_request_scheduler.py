@@ -0,0 +1,90 @@
+from email.utils import formatdate
+import pytest
+from utils.request_scheduler import RequestScheduler, TokenBucket, retry_after_seconds
+
+
+def test_bucket_allows_a_burst_then_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+    # Refill never exceeds the burst capacity
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(4)][-1] == pytest.approx(0.5)
+
+
+def test_bucket_acquire_waits_for_the_next_token(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    bucket.acquire()
+
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert clock.slept == [pytest.approx(0.25)]
+
+
+def test_pause_blocks_every_token_until_it_ends(clock):
+    bucket = TokenBucket(rate=10, burst=10)
+    bucket.pause(2)
+
+    assert bucket.try_acquire() == pytest.approx(2)
+    clock.now += 2
+    # The pause also emptied the bucket: tokens only come back at the normal rate
+    assert bucket.try_acquire() == pytest.approx(0.1)
+
+
+def test_zero_rate_is_unlimited(clock):
+    bucket = TokenBucket(rate=0)
+
+    assert all(bucket.try_acquire() == 0.0 for _ in range(100))
+
+
+@pytest.mark.parametrize("headers,expected", [
+    ({}, None),
+    ({"Retry-After": "3"}, 3.0),
+    ({"Retry-After": "-1"}, 0.0),
+    ({"Retry-After": "soon"}, None),
+])
+def test_retry_after_seconds(clock, make_response, headers, expected):
+    assert retry_after_seconds(make_response(429, **headers)) == expected
+
+
+def test_retry_after_http_date(clock, make_response):
+    headers = {"Retry-After": formatdate(clock.now + 30, usegmt=True)}
+
+    assert retry_after_seconds(make_response(429, **headers)) == pytest.approx(30, abs=1)
+
+
+def test_scheduler_honours_retry_after_on_429(clock, make_response):
+    scheduler = RequestScheduler(rate=100, burst=100, max_retries=2, backoff_base=0)
+    answers = iter([make_response(429, **{"Retry-After": "2"}), make_response(200)])
+
+    result = scheduler.send(lambda timeout: next(answers), "GET /movie/popular")
+
+    assert result.status_code == 200
+    # Retry-After first, then the bucket (emptied by the 429) refills one token at rate
+    assert clock.slept[0] == 2.0
+    assert sum(clock.slept) == pytest.approx(2.01)
+
+
+@pytest.mark.parametrize("retry_after", ["3600", "far future"])
+def test_scheduler_caps_long_retry_after(clock, make_response, retry_after):
+    if retry_after == "far future":
+        retry_after = formatdate(clock.now + 86400, usegmt=True)
+    scheduler = RequestScheduler(rate=100, burst=100, max_retries=1, backoff_base=0, backoff_max=8)
+    answers = iter([make_response(429, **{"Retry-After": retry_after}), make_response(200)])
+
+    assert scheduler.send(lambda timeout: next(answers), "GET /movie/popular").status_code == 200
+    assert clock.slept[0] == 8
+    assert scheduler.bucket.paused_until <= clock.now
+
+
+def test_scheduler_returns_the_last_response_when_retries_run_out(clock, make_response):
+    scheduler = RequestScheduler(rate=0, max_retries=1, backoff_base=0)
+    calls = []
+
+    result = scheduler.send(lambda timeout: calls.append(timeout) or make_response(503), "GET /movie/popular")
+
+    assert result.status_code == 503
+    assert len(calls) == 2
@@ -0,0 +1,132 @@
+import json
+import pytest
+from utils.request_scheduler import RequestScheduler
+from utils.response_cache import CacheStats, CachedEntry, ResponseCache, cache_key
+from utils.tmdb_client import TMDBClient
+
+BASE_URL = "http://tmdb.test/3"
+
+
+@pytest.fixture
+def entry(make_response):
+    def build(body, **headers):
+        return CachedEntry.from_response(make_response(200, body, **headers))
+    return build
+
+
+class FakeSession:
+    """Answers GETs from a list of responses and records the headers each request sent."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client():
+    cache = ResponseCache(max_entries=10, default_ttl=60, ttls={"genre/": 3600})
+    client = TMDBClient(base_url=BASE_URL, api_key="secret", cache=cache, scheduler=RequestScheduler(rate=0))
+
+    yield client
+
+    client.close()
+
+
+def test_cache_key_ignores_api_key_and_param_order():
+    url = f"{BASE_URL}/discover/movie"
+
+    assert cache_key(url, {"page": 2, "sort_by": "popularity.desc", "api_key": "a"}) == \
+        cache_key(url, {"api_key": "b", "sort_by": "popularity.desc", "page": 2})
+    assert cache_key(url, {"page": 1}) != cache_key(url, {"page": 2})
+
+
+def test_lru_evicts_the_least_recently_used_entry(clock, entry):
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", entry(b"a"))
+    cache.put("b", entry(b"b"))
+    cache.get("a")
+    cache.put("c", entry(b"c"))
+
+    assert cache.get("b") is None
+    assert [cache.get(key).content for key in ("a", "c")] == [b"a", b"c"]
+
+
+def test_ttl_uses_the_longest_matching_prefix(clock, entry):
+    cache = ResponseCache(default_ttl=60, ttls={"genre/": 3600, "genre/movie/": 10})
+    stored = entry(b"{}")
+
+    assert [cache.ttl_for(path) for path in ("/genre/movie/list", "genre/tv/list", "movie/popular")] == [10, 3600, 60]
+    clock.now += 30
+    assert cache.is_fresh(stored, "genre/tv/list")
+    assert not cache.is_fresh(stored, "genre/movie/list")
+
+
+def test_conditional_headers_come_from_the_stored_validators(entry):
+    validated = entry(b"{}", ETag='"v1"', **{"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    assert validated.conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert entry(b"{}").conditional_headers() == {}
+
+
+def test_disk_entries_survive_a_new_cache_without_the_api_key(tmp_path, clock, make_response):
+    stored = CachedEntry.from_response(make_response(200, b'{"page": 1}', url=f"{BASE_URL}/movie/popular?api_key=secret"))
+    ResponseCache(disk_dir=str(tmp_path)).put("k", stored)
+
+    loaded = ResponseCache(disk_dir=str(tmp_path)).get("k")
+
+    assert loaded.content == b'{"page": 1}'
+    assert "secret" not in "".join(path.read_text() for path in tmp_path.iterdir())
+    assert json.loads(loaded.to_response().text) == {"page": 1}
+
+
+def test_client_serves_fresh_entries_then_revalidates_with_etag(client, clock, make_response):
+    session = FakeSession(make_response(200, b'{"page": 1}', ETag='"v1"'), make_response(304))
+    client.session = session
+
+    first = client.get("movie/popular")
+    cached = client.get("movie/popular")
+    assert (first.status_code, cached.headers["X-Cache"]) == (200, "HIT")
+    assert len(session.sent_headers) == 1
+
+    # Past the TTL the stored ETag is sent; a 304 serves the stored body and restarts the TTL
+    clock.now += 61
+    revalidated = client.get("movie/popular")
+    assert session.sent_headers[1] == {"If-None-Match": '"v1"'}
+    assert (revalidated.status_code, revalidated.content) == (200, b'{"page": 1}')
+
+    clock.now += 30
+    client.get("movie/popular")
+    assert len(session.sent_headers) == 2
+
+
+def test_client_replaces_a_changed_entry(client, clock, make_response):
+    client.session = FakeSession(make_response(200, b"old", ETag='"v1"'), make_response(200, b"new", ETag='"v2"'))
+
+    client.get("movie/popular")
+    clock.now += 61
+
+    assert client.get("movie/popular").content == b"new"
+    assert client.get("movie/popular").content == b"new"
+
+
+def test_stats_count_only_this_cache_and_stored_misses(client, clock, make_response):
+    client.session = FakeSession(make_response(200, b"a", ETag='"v1"'), make_response(304), make_response(404))
+
+    client.get("movie/popular")
+    client.get("movie/popular")
+    clock.now += 61
+    client.get("movie/popular")
+    client.get("movie/top_rated")
+
+    assert client.cache.stats.counts == {"hits": 1, "misses": 2, "revalidated": 1, "stored": 1}
+    assert ResponseCache().stats.counts == dict.fromkeys(CacheStats.FIELDS, 0)
@@ -0,0 +1,73 @@
+from utils.schema import PageValidator, ViolationReport, discover_validator
+
+
+def movie(movie_id, **fields):
+    item = {"id": movie_id, "title": f"Movie {movie_id}", "release_date": "2010-05-01", "vote_average": 7.5}
+    item.update(fields)
+    return item
+
+
+def page(number, results, **fields):
+    payload = {"page": number, "results": results, "total_pages": 3, "total_results": 60}
+    payload.update(fields)
+    return payload
+
+
+def test_valid_page_has_no_violations():
+    report = PageValidator().validate_page(page(1, [movie(1), movie(2)]))
+
+    assert report.ok
+    assert (report.pages, report.items) == (1, 2)
+
+
+def test_violations_are_grouped_by_field_and_rule_across_pages():
+    payloads = [
+        page(1, [movie(1, title=""), movie(2, vote_average=11)]),
+        page(2, [movie(3, title="  "), movie(4)]),
+    ]
+    report = PageValidator().validate_stream(payloads)
+
+    assert (report.pages, report.items) == (2, 4)
+    assert dict(report.violations) == {
+        ("title", "non_empty"): [1, 3],
+        ("vote_average", "between:0..10"): [2],
+    }
+    assert "title [non_empty] x2: 1, 3" in report.summary()
+
+
+def test_missing_and_mistyped_fields_are_reported_not_raised():
+    item = movie(5, vote_average=True)
+    del item["release_date"]
+    report = PageValidator().validate_page(page(1, [item]))
+
+    # bool is an int subclass but never a valid number
+    assert set(report.violations) == {("release_date", "required"), ("vote_average", "type:int|float")}
+
+
+def test_page_level_violations_use_the_page_as_id():
+    report = PageValidator().validate_page(page(501, "not a list"))
+
+    assert dict(report.violations) == {
+        ("page", "between:1..500"): ["page 501"],
+        ("results", "type:list"): ["page 501"],
+    }
+    assert report.items == 0
+
+
+def test_results_that_are_not_objects_are_reported():
+    report = PageValidator().validate_page(page(3, [movie(1), None, "movie"]))
+
+    assert dict(report.violations) == {("results", "object"): ["page 3 #1", "page 3 #2"]}
+    assert report.items == 3
+
+
+def test_discover_validator_adds_filter_rules():
+    validator = discover_validator(start_year=2000, end_year=2010, vote_min=5)
+    report = ViolationReport()
+    validator.validate_page(page(1, [movie(1), movie(2, release_date="1999-12-31"), movie(3, release_date="")]), report)
+    validator.validate_page(page(2, [movie(4, vote_average=4.9)]), report)
+
+    assert dict(report.violations) == {
+        ("release_date", "year_between:2000..2010"): [2, 3],
+        ("vote_average", "between:5..None"): [4],
+    }
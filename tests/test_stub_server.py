@@ -0,0 +1,35 @@
+import pytest
+from utils.stub_server import discover
+
+CATALOGUE = [
+    {"id": 1, "title": "Old", "release_date": "1999-04-01", "popularity": 5.0, "vote_average": 6.0},
+    {"id": 2, "title": "Unreleased", "release_date": "", "popularity": 9.0, "vote_average": 0},
+    {"id": 3, "title": "New", "release_date": "2021-07-15", "popularity": 7.0, "vote_average": 8.0},
+    {"id": 4, "title": "Undated", "popularity": 1.0, "vote_average": 5.0},
+]
+
+
+def ids(payload):
+    return [movie["id"] for movie in payload["results"]]
+
+
+@pytest.mark.parametrize("sort_by,expected", [
+    ("release_date.asc", [1, 3, 2, 4]),
+    ("release_date.desc", [3, 1, 2, 4]),
+    ("popularity.desc", [2, 3, 1, 4]),
+])
+def test_items_without_the_sort_field_go_last(sort_by, expected):
+    assert ids(discover(CATALOGUE, "movie", {"sort_by": sort_by})) == expected
+
+
+def test_filters_and_paging():
+    payload = discover(CATALOGUE, "movie", {"release_date.gte": "2000-01-01", "vote_average.gte": "7"})
+
+    assert ids(payload) == [3]
+    assert (payload["page"], payload["total_pages"], payload["total_results"]) == (1, 1, 1)
+
+
+@pytest.mark.parametrize("page", ["abc", "0", "501"])
+def test_invalid_page_is_rejected(page):
+    with pytest.raises(ValueError):
+        discover(CATALOGUE, "movie", {"page": page})
@@ -0,0 +1,148 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from utils.config import (
+    ARTIFACTS_DIR, ARTIFACT_IMAGE_FORMAT, ARTIFACT_IMAGE_MAX_KB, ARTIFACT_IMAGE_MAX_WIDTH, ARTIFACT_MAX_MB,
+    ARTIFACT_WORKERS, REPORTS_DIR,
+)
+from utils.logger import get_logger
+from utils.worker import worker_count
+
+logger = get_logger(__name__)
+
+QUALITY_STEPS = (80, 65, 50, 35)
+EXTENSIONS = {"png": "png", "webp": "webp", "jpeg": "jpg"}
+
+
+# Pillow is optional (screenshots are then kept as PNG) and only imported once a screenshot is taken
+def _image_format():
+    try:
+        from PIL import features
+    except ImportError:
+        return "png"
+    if ARTIFACT_IMAGE_FORMAT == "webp" and features.check("webp"):
+        return "webp"
+    return "jpeg"
+
+
+# Downscale and re-encode a PNG screenshot, lowering quality until it fits the size cap
+def compress_screenshot(png, image_format, max_width=ARTIFACT_IMAGE_MAX_WIDTH, max_bytes=ARTIFACT_IMAGE_MAX_KB * 1024):
+    if image_format == "png":
+        return png
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    if image.width > max_width:
+        image = image.resize((max_width, round(image.height * max_width / image.width)))
+    for quality in QUALITY_STEPS:
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format.upper(), quality=quality)
+        if buffer.tell() <= max_bytes:
+            break
+    return buffer.getvalue()
+
+
+class ArtifactStore:
+    """Failure artifacts written by a background pool into content-addressed files.
+
+    capture() only pulls the raw bytes from the browser (that must happen while the test still
+    owns the driver) and returns report links straight away; compression and disk writes run on
+    the pool. Once the session budget is spent, later failures are reported without artifacts.
+    """
+
+    def __init__(self, root=ARTIFACTS_DIR, max_bytes=ARTIFACT_MAX_MB * 1024 * 1024, workers=ARTIFACT_WORKERS):
+        self.root = root
+        # The budget is per session: parallel workers split it
+        self.max_bytes = max_bytes / worker_count()
+        self.written_bytes = 0
+        self.files = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+
+    @cached_property
+    def image_format(self):
+        return _image_format()
+
+    @property
+    def exhausted(self):
+        return bool(self.max_bytes) and self.written_bytes >= self.max_bytes
+
+    def capture(self, driver, name):
+        """Grab screenshot, DOM and console from `driver`; return [(label, path relative to the report)]."""
+        from selenium.common.exceptions import WebDriverException
+
+        if self.exhausted:
+            logger.warning(f"Artifact budget of {self.max_bytes / 1024 / 1024:.0f} MB spent; nothing saved for {name}")
+            return []
+
+        sources = [
+            ("Screenshot", EXTENSIONS[self.image_format], driver.get_screenshot_as_png,
+             lambda png: compress_screenshot(png, self.image_format)),
+            ("DOM", "html", lambda: driver.page_source.encode("utf-8"), None),
+            ("Console", "json", lambda: json.dumps(driver.get_log("browser"), indent=1).encode("utf-8"), None),
+        ]
+        links = []
+        for label, extension, grab, encode in sources:
+            try:
+                raw = grab()
+            except WebDriverException as e:
+                logger.warning(f"Could not capture {label.lower()} for {name}: {e.msg}")
+                continue
+            path = self._submit(raw, extension, encode)
+            if path:
+                links.append((label, path))
+        return links
+
+    # Bytes to hold back for a pending write: screenshots are re-encoded to at most the image cap
+    @staticmethod
+    def _reservation(raw, encode):
+        return min(len(raw), ARTIFACT_IMAGE_MAX_KB * 1024) if encode else len(raw)
+
+    def _submit(self, raw, extension, encode):
+        file_name = f"{hashlib.sha1(raw).hexdigest()[:16]}.{extension}"
+        reserved = self._reservation(raw, encode)
+        with self._lock:
+            first_time = file_name not in self._seen
+            if first_time:
+                # Reserve the budget now, so a burst of failures cannot overshoot it while writes queue up
+                if self.max_bytes and self.written_bytes + reserved > self.max_bytes:
+                    logger.warning(f"Artifact budget would be exceeded; not saving {file_name}")
+                    return None
+                self.written_bytes += reserved
+                self._seen.add(file_name)
+        if first_time:
+            self._executor.submit(self._write, raw, file_name, encode, reserved)
+        return os.path.relpath(os.path.join(self.root, file_name), REPORTS_DIR).replace(os.sep, "/")
+
+    def _write(self, raw, file_name, encode, reserved):
+        path = os.path.join(self.root, file_name)
+        written = 0
+        try:
+            if os.path.exists(path):  # Same content already saved by another worker or run
+                return
+            data = encode(raw) if encode else raw
+            os.makedirs(self.root, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            written = len(data)
+            with self._lock:
+                self.files += 1
+        except Exception as e:
+            logger.error(f"Could not write artifact {path}: {e}")
+        finally:
+            # Settle the reservation against what actually reached the disk
+            with self._lock:
+                self.written_bytes += written - reserved
+
+    # Wait for pending writes (end of session)
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self.files:
+            logger.info(f"Wrote {self.files} failure artifacts ({self.written_bytes / 1024:.0f} KB) to {self.root}")
@@ -0,0 +1,44 @@
+import pytest
+from utils.logger import get_logger
+from utils.response_cache import CacheStats
+
+# pytest plugin: reports the session API client's response cache hits/misses at session end
+# (xdist workers ship their counts to the controller, which prints the total)
+
+logger = get_logger(__name__)
+
+SESSION_CACHE = pytest.StashKey()
+TOTALS = pytest.StashKey()
+
+
+def pytest_configure(config):
+    config.stash[TOTALS] = CacheStats()
+
+
+# Called by the session tmdb_client fixture: only that cache's counts are reported
+def track_session_cache(config, cache):
+    if cache is not None:
+        config.stash[SESSION_CACHE] = cache
+
+
+def pytest_sessionfinish(session):
+    cache = session.config.stash.get(SESSION_CACHE, None)
+    if cache is None:
+        return
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["api_cache"] = dict(cache.stats.counts)
+    else:
+        session.config.stash[TOTALS].merge(cache.stats.counts)
+    logger.info(f"API response cache: {cache.stats.summary()}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    node.config.stash[TOTALS].merge(getattr(node, "workeroutput", {}).get("api_cache", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    totals = config.stash[TOTALS]
+    if any(totals.counts.values()):
+        terminalreporter.section("api cache")
+        terminalreporter.write_line(totals.summary())
@@ -1,7 +1,105 @@
-BASE_URL = "https://tmdb-discover.surge.sh"
+import os
+from utils.worker import worker_index
+
+# Local TMDB stand-in: "off" hits the live services, "record" proxies and stores them, "replay" serves the recordings
+TMDB_STUB = os.getenv("TMDB_STUB", "off")
+STUB_HOST = "127.0.0.1"
+# Each parallel worker runs its own stand-in on a neighbouring port
+STUB_PORT = int(os.getenv("STUB_PORT", "8765")) + worker_index()
+STUB_LATENCY_MS = int(os.getenv("STUB_LATENCY_MS", "0"))
+# Emulate TMDB's rate limit: API requests above this many per second get 429 + Retry-After (0 = off)
+STUB_RATE_LIMIT = float(os.getenv("STUB_RATE_LIMIT", "0"))
+STUB_FIXTURES_DIR = os.getenv("STUB_FIXTURES_DIR", os.path.join("fixtures", "tmdb"))
+STUB_URL = f"http://{STUB_HOST}:{STUB_PORT}"
+
+LIVE_BASE_URL = "https://tmdb-discover.surge.sh"
+LIVE_TMDB_API_URL = "https://api.themoviedb.org/3"
+
+BASE_URL = LIVE_BASE_URL if TMDB_STUB == "off" else STUB_URL
 BROWSER = "chrome"
-IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 10
+# Readiness waits (no implicit waits: every wait is explicit and polled)
+READINESS_POLL_INTERVAL = 0.05
+NETWORK_IDLE_MS = 300
+DOM_QUIET_MS = 200
+# Prefer native CSS selectors over XPath where the locator registry has an equivalent
+USE_CSS_LOCATORS = os.getenv("USE_CSS_LOCATORS", "1") == "1"
+# Pagination crawl: pages to visit at most, and how many browsers walk them in parallel
+CRAWL_PAGE_BUDGET = int(os.getenv("CRAWL_PAGE_BUDGET", "20"))
+CRAWL_UI_CONCURRENCY = int(os.getenv("CRAWL_UI_CONCURRENCY", "2"))
+# Filter combination tests cover every N-wise value tuple (2 = pairwise, 5 = the full cross product)
+FILTER_MATRIX_STRENGTH = int(os.getenv("FILTER_MATRIX_STRENGTH", "2"))
 # Paths
 REPORTS_DIR = "reports"
 LOGS_DIR = "logs"
+# Failure artifacts (screenshot, DOM, console) under REPORTS_DIR/artifacts, named by content hash.
+# Screenshots are re-encoded (WebP, else JPEG; needs Pillow) to at most ARTIFACT_IMAGE_MAX_WIDTH px
+# and ARTIFACT_IMAGE_MAX_KB; capture stops once the session has written ARTIFACT_MAX_MB (0 = no cap)
+ARTIFACTS_DIR = os.path.join(REPORTS_DIR, "artifacts")
+ARTIFACT_WORKERS = int(os.getenv("ARTIFACT_WORKERS", "2"))
+ARTIFACT_IMAGE_FORMAT = os.getenv("ARTIFACT_IMAGE_FORMAT", "webp")
+ARTIFACT_IMAGE_MAX_WIDTH = int(os.getenv("ARTIFACT_IMAGE_MAX_WIDTH", "1280"))
+ARTIFACT_IMAGE_MAX_KB = int(os.getenv("ARTIFACT_IMAGE_MAX_KB", "200"))
+ARTIFACT_MAX_MB = float(os.getenv("ARTIFACT_MAX_MB", "200"))
+# Logging: "size" or "time" rotation, "text" or "json" lines; per-item chatter at or below
+# LOG_ITEM_LEVEL is only written for failing tests
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "1") == "1"
+LOG_ITEM_LEVEL = 10  # logging.DEBUG
+# Flaky tests: a failing test is rerun in-process (same warm driver) up to FLAKY_RERUNS times while the session's
+# FLAKY_RERUN_BUDGET (seconds) lasts. A test whose flakiness score over its last FLAKY_HISTORY runs reaches
+# FLAKY_QUARANTINE_SCORE (once it has FLAKY_MIN_RUNS runs) moves to the non-blocking quarantine lane
+FLAKY_RERUNS = int(os.getenv("FLAKY_RERUNS", "2"))
+FLAKY_RERUN_BUDGET = float(os.getenv("FLAKY_RERUN_BUDGET", "300"))
+FLAKY_HISTORY = int(os.getenv("FLAKY_HISTORY", "20"))
+FLAKY_MIN_RUNS = int(os.getenv("FLAKY_MIN_RUNS", "5"))
+FLAKY_QUARANTINE_SCORE = float(os.getenv("FLAKY_QUARANTINE_SCORE", "0.2"))
+# Driver pool ("pool" leases warm browsers, "fresh" launches one per test)
+DRIVER_MODE = os.getenv("DRIVER_MODE", "pool")
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "25"))
+# Resolved chromedriver path/version, reused across runs (delete it to force a new lookup)
+DRIVER_LOCK_FILE = os.getenv("DRIVER_LOCK_FILE", ".chromedriver.lock.json")
+# Browser ("HEADLESS=1" forces headless; parallel workers always run headless)
+HEADLESS = os.getenv("HEADLESS", "0") == "1"
+WINDOW_SIZE = (1920, 1080)
+# "default" is a normal Chrome; "throughput" is headless, eager-loading and skips images/fonts/analytics
+BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "default")
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*image.tmdb.org*",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+# Network capture: JSON bodies of the app's TMDB list/discover responses, read from Chrome's performance
+# log so pages can check results as the app received them ("0" turns the performance log off)
+NETWORK_CAPTURE = os.getenv("NETWORK_CAPTURE", "1") == "1"
+NETWORK_CAPTURE_URL = r"/3/(discover/(movie|tv)|(movie|tv)/(popular|top_rated|now_playing|upcoming)|trending/)"
+NETWORK_CAPTURE_BUFFER = int(os.getenv("NETWORK_CAPTURE_BUFFER", "50"))
+# TMDB API
+TMDB_API_URL = LIVE_TMDB_API_URL if TMDB_STUB == "off" else f"{STUB_URL}/3"
+TMDB_API_KEY = os.getenv("TMDB_API_KEY", "add494e96808c55b3ee7f940c9d5e5b6")
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "10"))
+# API request scheduling: requests/second (0 = unlimited; TMDB allows roughly 40-50), burst size,
+# concurrent requests, (connect, read) timeouts in seconds, and retries on 429/5xx with backoff
+API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", "40" if TMDB_STUB == "off" else "0"))
+API_BURST = int(os.getenv("API_BURST", "20"))
+API_MAX_IN_FLIGHT = int(os.getenv("API_MAX_IN_FLIGHT", str(API_MAX_CONNECTIONS)))
+API_TIMEOUT = (float(os.getenv("API_CONNECT_TIMEOUT", "5")), float(os.getenv("API_READ_TIMEOUT", "20")))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "4"))
+API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "0.5"))
+API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", "8"))
+# API response cache: "memory" (LRU), "disk" (LRU backed by API_CACHE_DIR) or "off"
+API_CACHE = os.getenv("API_CACHE", "memory")
+API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "512"))
+API_CACHE_DIR = os.getenv("API_CACHE_DIR", os.path.join(".cache", "tmdb"))
+# Seconds a response is reused without asking the server; per path prefix, longest match wins
+API_CACHE_TTL = int(os.getenv("API_CACHE_TTL", "300"))
+API_CACHE_TTLS = {
+    "genre/": 24 * 3600,
+    "configuration": 24 * 3600,
+    "movie/": 600,
+    "discover/": 600,
+}
@@ -0,0 +1,133 @@
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How the demo site turns its filters into a /discover query (mirrors the app; update both together)
+MEDIA_TYPES = {"Movie": "movie", "TV Shows": "tv"}
+DATE_FIELDS = {"movie": "primary_release_date", "tv": "first_air_date"}
+CATEGORY_SORT = {
+    "Popular": "popularity.desc",
+    "Newest": "primary_release_date.desc",
+    "Top rated": "vote_average.desc",
+}
+# The rating widget is out of 5 stars; TMDB votes are out of 10
+VOTES_PER_STAR = 2
+
+
+class FilterSet:
+    """One combination of the UI filters; None means "leave that filter alone"."""
+
+    def __init__(self, category=None, type_name="Movie", genre=None, year_range=None, stars=None):
+        self.category = category
+        self.type_name = type_name
+        self.genre = genre
+        self.year_range = year_range
+        self.stars = stars
+
+    @property
+    def media(self):
+        return MEDIA_TYPES[self.type_name or "Movie"]
+
+    def as_kwargs(self):
+        return {
+            "category": self.category,
+            "type_name": self.type_name,
+            "genre": self.genre,
+            "year_range": self.year_range,
+            "stars": self.stars,
+        }
+
+    # The equivalent /discover/{media} query; genre_ids maps genre names to TMDB ids
+    def discover_params(self, genre_ids=None, page=1):
+        if self.category and self.category not in CATEGORY_SORT:
+            raise ValueError(f"Category '{self.category}' has no /discover equivalent")
+        params = {"sort_by": CATEGORY_SORT.get(self.category, "popularity.desc"), "page": page}
+        if self.genre:
+            params["with_genres"] = (genre_ids or {})[self.genre]
+        if self.year_range:
+            date_field = DATE_FIELDS[self.media]
+            params[f"{date_field}.gte"] = f"{self.year_range[0]}-01-01"
+            params[f"{date_field}.lte"] = f"{self.year_range[1]}-12-31"
+        if self.stars:
+            params["vote_average.gte"] = self.stars * VOTES_PER_STAR
+        return params
+
+    # Filter parameters the app should send for this set (sort order only when a category is chosen)
+    def query_params(self, genre_ids=None):
+        params = self.discover_params(genre_ids)
+        params.pop("page")
+        if not self.category:
+            params.pop("sort_by")
+        return params
+
+    # Accepts a captured response whose request carried exactly these filters
+    def matches_capture(self, response, genre_ids=None):
+        return response.matches(self.query_params(genre_ids), media=self.media)
+
+    def __repr__(self):
+        parts = [f"{name}={value}" for name, value in self.as_kwargs().items() if value]
+        return "-".join(parts) or "defaults"
+
+
+class CrossCheckResult:
+    """Grid vs API for one filter set, compared by (title, year)."""
+
+    def __init__(self, filters, ui_items, api_items):
+        self.filters = filters
+        self.ui = set(ui_items)
+        self.api = set(api_items)
+        self.matched = self.ui & self.api
+        self.only_ui = sorted(self.ui - self.api)
+        self.only_api = sorted(self.api - self.ui)
+
+    @property
+    def ok(self):
+        return bool(self.api) and not self.only_ui and not self.only_api
+
+    def summary(self):
+        lines = [f"{self.filters!r}: {len(self.matched)} matched, {len(self.only_ui)} only in the grid, "
+                 f"{len(self.only_api)} only in the API"]
+        lines += [f"  grid only: {title} ({year})" for title, year in self.only_ui]
+        lines += [f"  API only:  {title} ({year})" for title, year in self.only_api]
+        return "\n".join(lines)
+
+
+def _key(title, year):
+    return (title or "").strip().casefold(), (year or "").strip() or None
+
+
+def grid_items(cards):
+    return [_key(card["title"], card["year"]) for card in cards]
+
+
+def api_items(payload, media):
+    title_field = "title" if media == "movie" else "name"
+    date_field = "release_date" if media == "movie" else "first_air_date"
+    return [_key(item.get(title_field), (item.get(date_field) or "")[:4]) for item in payload.get("results", [])]
+
+
+def genre_ids(client, media):
+    response = client.get(f"genre/{media}/list")
+    response.raise_for_status()
+    return {genre["name"]: genre["id"] for genre in response.json().get("genres", [])}
+
+
+def cross_check(home, client, filters, page=1):
+    """Apply `filters` through the HomePage while the API side is fetched on the client's pool, then diff."""
+
+    def fetch():
+        ids = genre_ids(client, filters.media) if filters.genre else None
+        response = client.get(f"discover/{filters.media}", filters.discover_params(ids, page))
+        response.raise_for_status()
+        return response.json()
+
+    # The browser must stay on this thread; the API round trips overlap with the UI actions
+    api_future = client.submit(fetch)
+    home.apply_filters(**filters.as_kwargs())
+    if page != 1:
+        home.go_to_page(page)
+    cards = home.snapshot_results()
+
+    result = CrossCheckResult(filters, grid_items(cards), api_items(api_future.result(), filters.media))
+    logger.info(result.summary())
+    return result
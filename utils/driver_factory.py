@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+import time
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from utils.config import BLOCKED_URL_PATTERNS, BROWSER_PROFILE, HEADLESS, NETWORK_CAPTURE, WINDOW_SIZE
+from utils.driver_provisioning import invalidate_chromedriver, resolve_chromedriver
+from utils.instrumentation import instrument_driver, timings
+from utils.logger import get_logger
+from utils.network_capture import NetworkCapture
+from utils.readiness import install_readiness_probe
+from utils.worker import is_worker, worker_id
+
+logger = get_logger(__name__)
+
+
+def _throughput():
+    return BROWSER_PROFILE == "throughput"
+
+
+def _headless():
+    return HEADLESS or is_worker() or _throughput()
+
+
+def build_chrome_options(profile_dir):
+    options = webdriver.ChromeOptions()
+    # Each browser gets its own throwaway profile so workers never share state
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    # Keep the browser console so failure artifacts can include it, and DevTools network events for NetworkCapture
+    logging_prefs = {"browser": "ALL"}
+    if NETWORK_CAPTURE:
+        logging_prefs["performance"] = "ALL"
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    options.set_capability("goog:loggingPrefs", logging_prefs)
+    if _headless():
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    if _throughput():
+        # Tests only read text and attributes: skip painting work the assertions never look at
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.page_load_strategy = "eager"
+    return options
+
+
+# Drop image, font and analytics requests before they leave the browser
+def block_heavy_requests(driver):
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except WebDriverException as e:
+        logger.warning(f"Could not enable request blocking: {e}")
+
+
+def _launch_chrome(profile_dir):
+    return webdriver.Chrome(
+        service=Service(resolve_chromedriver()),
+        options=build_chrome_options(profile_dir),
+    )
+
+
+def create_driver():
+    """Launch and return a new Chrome WebDriver."""
+    launch_start = time.perf_counter()
+    profile_dir = tempfile.mkdtemp(prefix=f"chrome-{worker_id()}-")
+    try:
+        try:
+            driver = _launch_chrome(profile_dir)
+        except SessionNotCreatedException as e:
+            # Usually a locked driver that no longer matches an updated Chrome: re-resolve once
+            logger.warning(f"Chrome session not created with locked driver, re-resolving: {e.msg}")
+            invalidate_chromedriver()
+            driver = _launch_chrome(profile_dir)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_dir = profile_dir
+    try:
+        if not _headless():
+            driver.maximize_window()
+        if _throughput():
+            block_heavy_requests(driver)
+        install_readiness_probe(driver)
+        driver.network = NetworkCapture(driver) if NETWORK_CAPTURE else None
+        timings.record("browser", "launch", time.perf_counter() - launch_start)
+        return instrument_driver(driver)
+    except Exception:
+        # Nobody holds the driver yet: quit it here or the Chrome process and its profile outlive the run
+        try:
+            quit_driver(driver)
+        except Exception as e:
+            logger.warning(f"Could not quit a browser whose setup failed: {e}")
+        raise
+
+
+def quit_driver(driver):
+    """Quit the browser and remove its temporary profile."""
+    try:
+        driver.quit()
+    finally:
+        profile_dir = getattr(driver, "profile_dir", None)
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
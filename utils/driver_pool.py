@@ -0,0 +1,131 @@
+import threading
+from selenium.common.exceptions import WebDriverException
+from utils.config import BASE_URL, DRIVER_POOL_SIZE, DRIVER_MAX_USES
+from utils.driver_factory import create_driver, quit_driver
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PooledDriver:
+    """A browser owned by the pool plus its usage counter."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """Keeps up to `size` warm browsers alive and leases them to tests."""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, factory=create_driver, closer=quit_driver):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.factory = factory
+        self.closer = closer
+        self._idle = []
+        self._leased = {}
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    # Lease a browser, reset to a clean BASE_URL state
+    def acquire(self, timeout=None):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            while not self._idle and self._created >= self.size:
+                if not self._cond.wait(timeout):
+                    raise TimeoutError(f"No pooled driver became free within {timeout}s")
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                self._created += 1
+
+        if entry is None:
+            entry = self._launch()
+
+        try:
+            self._reset(entry.driver)
+        except WebDriverException as e:
+            logger.warning(f"Pooled driver failed reset, recycling it: {e}")
+            self._quit(entry)
+            entry = self._launch()
+            try:
+                self._reset(entry.driver)
+            except Exception:
+                self._discard(entry)
+                raise
+
+        entry.uses += 1
+        with self._cond:
+            self._leased[id(entry.driver)] = entry
+        return entry.driver
+
+    # Give a browser back; recycle it when worn out or crashed
+    def release(self, driver, broken=False):
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            return
+
+        if broken or entry.uses >= self.max_uses or not self._is_alive(driver):
+            logger.info(f"Recycling pooled driver after {entry.uses} uses")
+            self._discard(entry)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._quit(entry)
+                return
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            entries = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._created = 0
+        for entry in entries:
+            self._quit(entry)
+
+    def _launch(self):
+        try:
+            logger.info("Launching pooled driver")
+            return PooledDriver(self.factory())
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    # Drop cookies and web storage, then land on the home page
+    @staticmethod
+    def _reset(driver):
+        driver.delete_all_cookies()
+        if getattr(driver, "network", None):
+            driver.network.clear()
+        if driver.current_url.startswith(("http://", "https://")):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get(BASE_URL)
+
+    def _discard(self, entry):
+        self._quit(entry)
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _quit(self, entry):
+        try:
+            self.closer(entry.driver)
+        except WebDriverException as e:
+            logger.warning(f"Error quitting pooled driver: {e}")
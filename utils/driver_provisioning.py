@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+from datetime import datetime
+from utils.config import DRIVER_LOCK_FILE
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_resolved = None
+
+
+def _driver_version(path):
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        # "ChromeDriver 120.0.6099.109 (...)"
+        return output.split()[1] if output.startswith("ChromeDriver") else output.strip()
+    except (OSError, subprocess.SubprocessError, IndexError):
+        return None
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_lock():
+    if not os.path.exists(DRIVER_LOCK_FILE):
+        return None
+    try:
+        with open(DRIVER_LOCK_FILE, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable driver lock file {DRIVER_LOCK_FILE}: {e}")
+        return None
+    return entry if _usable(entry.get("path")) else None
+
+
+def _write_lock(entry):
+    try:
+        with open(DRIVER_LOCK_FILE, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write driver lock file {DRIVER_LOCK_FILE}: {e}")
+
+
+def _from_environment():
+    return os.getenv("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+
+
+def _from_webdriver_manager():
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+# Selenium Manager ships with selenium; --offline makes it use only what is already on disk
+def _from_selenium_manager(offline):
+    from selenium.webdriver.common.selenium_manager import SeleniumManager
+    args = ["--browser", "chrome"] + (["--offline"] if offline else [])
+    return SeleniumManager().binary_paths(args).get("driver_path")
+
+
+RESOLVERS = [
+    ("environment", _from_environment),
+    ("selenium-manager-offline", lambda: _from_selenium_manager(offline=True)),
+    ("webdriver-manager", _from_webdriver_manager),
+    ("selenium-manager", lambda: _from_selenium_manager(offline=False)),
+]
+
+
+def resolve_chromedriver():
+    """Return the chromedriver path, resolving it at most once per session and reusing the lock file across runs."""
+    global _resolved
+    with _lock:
+        if _resolved:
+            return _resolved["path"]
+
+        entry = _read_lock()
+        if entry:
+            logger.info(f"Using locked chromedriver {entry.get('version')} at {entry['path']}")
+            _resolved = entry
+            return entry["path"]
+
+        for source, resolver in RESOLVERS:
+            try:
+                path = resolver()
+            except Exception as e:
+                logger.warning(f"chromedriver lookup via {source} failed: {e}")
+                continue
+            if _usable(path):
+                entry = {
+                    "path": path,
+                    "version": _driver_version(path),
+                    "source": source,
+                    "resolved_at": datetime.now().isoformat(timespec="seconds"),
+                }
+                logger.info(f"Resolved chromedriver {entry['version']} via {source}: {path}")
+                _write_lock(entry)
+                _resolved = entry
+                return path
+
+        raise RuntimeError("Unable to locate chromedriver: set CHROMEDRIVER_PATH or install it on PATH")
+
+
+def invalidate_chromedriver():
+    """Forget the resolved driver (e.g. after Chrome updated and the locked driver no longer matches)."""
+    global _resolved
+    with _lock:
+        _resolved = None
+        if os.path.exists(DRIVER_LOCK_FILE):
+            os.remove(DRIVER_LOCK_FILE)
@@ -0,0 +1,144 @@
+import heapq
+import re
+import statistics
+from collections import defaultdict
+import pytest
+from utils.logger import get_logger
+from utils.worker import GROUP_SUFFIX, base_nodeid
+
+# pytest plugin: duration-aware ordering for parallel runs.
+# Every run stores per-test durations (setup + call + teardown, smoothed) in the pytest cache. With --lpt,
+# tests that share setup state are put in one xdist_group (so module fixtures and checkpoints are built once,
+# on one worker) and groups are queued longest-first, which is LPT list scheduling under `--dist loadgroup`.
+# The terminal summary compares the makespan LPT predicted with what each worker actually spent.
+
+logger = get_logger(__name__)
+
+DURATIONS_KEY = "durations/tests"
+# Weight of the newest run in the stored (exponentially smoothed) duration
+SMOOTHING = 0.5
+DEFAULT_DURATION = 1.0
+
+
+def pytest_addoption(parser):
+    parser.getgroup("xdist").addoption(
+        "--lpt", action="store_true",
+        help="group tests by shared setup and queue the longest groups first (use with --dist loadgroup)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "shared_state(key): tests with the same key reuse one setup state")
+    # Durations live in the pytest cache (absent under -p no:cacheprovider)
+    if hasattr(config, "cache"):
+        config.pluginmanager.register(DurationScheduler(config), "duration-scheduler")
+
+
+# Assign groups to `workers` longest-first, always onto the least loaded worker; returns the makespan
+def lpt_makespan(group_costs, workers):
+    loads = [0.0] * max(1, workers)
+    for cost in sorted(group_costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+class DurationScheduler:
+    def __init__(self, config):
+        self.config = config
+        self.enabled = config.getoption("lpt")
+        self.is_worker = hasattr(config, "workerinput")
+        self.history = config.cache.get(DURATIONS_KEY, {})
+        known = list(self.history.values())
+        self.default = statistics.median(known) if known else DEFAULT_DURATION
+        self.durations = defaultdict(float)
+        self.busy = defaultdict(float)
+        self.collected = None
+        self.nodes = set()
+        if self.enabled and not self.is_worker:
+            # xdist would otherwise re-sort groups by test count and undo the LPT order
+            config.option.loadscopereorder = False
+
+    def estimate(self, nodeid):
+        return self.history.get(base_nodeid(nodeid), self.default)
+
+    # Tests that must share a worker: same module-scoped fixtures, or the same shared_state mark
+    @staticmethod
+    def group_of(item):
+        mark = item.get_closest_marker("shared_state")
+        if mark:
+            return f"state:{mark.args[0]}"
+        fixture_defs = getattr(item, "_fixtureinfo", None)
+        module_fixtures = sorted(
+            name for name, defs in (fixture_defs.name2fixturedefs.items() if fixture_defs else [])
+            if defs and defs[-1].scope == "module"
+        )
+        if module_fixtures:
+            return f"{item.module.__name__}:{'+'.join(module_fixtures)}"
+        return None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not self.enabled:
+            return
+        groups = defaultdict(list)
+        for item in items:
+            group = self.group_of(item)
+            groups[group or item.nodeid].append(item)
+            # Only --dist loadgroup acts on the mark; other modes ignore it
+            if group:
+                item.add_marker(pytest.mark.xdist_group(re.sub(r"[^\w.:/-]", "_", group)))
+
+        costs = {key: sum(self.estimate(item.nodeid) for item in members) for key, members in groups.items()}
+        items[:] = [item for key in sorted(groups, key=lambda key: -costs[key]) for item in groups[key]]
+
+        if not self.is_worker:
+            self.collected = costs
+
+    # ---- controller side under xdist ----
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        if self.collected is None:
+            costs = defaultdict(float)
+            for nodeid in ids:
+                match = GROUP_SUFFIX.search(nodeid)
+                costs[match.group(0) if match else nodeid] += self.estimate(nodeid)
+            self.collected = dict(costs)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodeready(self, node):
+        self.nodes.add(node.gateway.id)
+
+    # ---- measurements ----
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "master"
+        self.durations[base_nodeid(report.nodeid)] += report.duration
+        self.busy[worker] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or not self.durations:
+            return
+        history = dict(self.history)
+        for nodeid, seconds in self.durations.items():
+            previous = history.get(nodeid)
+            history[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        session.config.cache.set(DURATIONS_KEY, history)
+        logger.info(f"Stored durations for {len(self.durations)} tests ({len(history)} known)")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.busy:
+            return
+        write = terminalreporter.write_line
+        terminalreporter.section("duration schedule")
+        actual = max(self.busy.values())
+        if self.enabled and self.collected:
+            workers = len(self.nodes) or 1
+            predicted = lpt_makespan(self.collected.values(), workers)
+            write(f"Predicted makespan (LPT, {workers} workers, {len(self.collected)} groups): {predicted:.1f}s")
+        write(f"Actual makespan: {actual:.1f}s")
+        for worker, seconds in sorted(self.busy.items()):
+            write(f"  {worker}: {seconds:.1f}s busy, {actual - seconds:.1f}s idle")
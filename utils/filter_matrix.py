@@ -0,0 +1,59 @@
+from itertools import combinations, product
+import pytest
+from utils.config import FILTER_MATRIX_STRENGTH
+from utils.cross_check import FilterSet
+from utils.test_data import CATEGORY_DATA, GENRE_DATA, RATING_DATA, TYPE_DATA, YEAR_RANGE_DATA
+
+# The UI filter space: FilterSet field -> values worth covering
+FILTER_SPACE = {
+    "category": list(CATEGORY_DATA),
+    "type_name": TYPE_DATA,
+    "genre": GENRE_DATA,
+    "year_range": YEAR_RANGE_DATA,
+    "stars": RATING_DATA,
+}
+
+
+# Combinations the app cannot show (TV genres are named differently, e.g. "Action & Adventure")
+def is_valid(combination):
+    return not (combination.get("type_name") == "TV Shows" and combination.get("genre") == "Action")
+
+
+def covering_array(space, strength=2, valid=is_valid):
+    """Smallest-effort set of combinations in which every `strength`-wise value tuple appears at least once.
+
+    Greedy and deterministic: each step takes the first valid row (in cross-product order) covering the
+    most still-uncovered tuples. Tuples that only occur in invalid rows are never required.
+    """
+    names = list(space)
+    strength = max(1, min(strength, len(names)))
+    rows = [row for row in product(*space.values()) if valid(dict(zip(names, row)))]
+    positions = list(combinations(range(len(names)), strength))
+
+    def tuples(row):
+        return {(pos, tuple(row[i] for i in pos)) for pos in positions}
+
+    row_tuples = [tuples(row) for row in rows]
+    uncovered = set().union(*row_tuples) if rows else set()
+    chosen = []
+    while uncovered:
+        best = max(range(len(rows)), key=lambda index: len(row_tuples[index] & uncovered))
+        chosen.append(dict(zip(names, rows[best])))
+        uncovered -= row_tuples[best]
+    return chosen
+
+
+def filter_matrix(strength=FILTER_MATRIX_STRENGTH, space=None):
+    return [FilterSet(**combination) for combination in covering_array(space or FILTER_SPACE, strength)]
+
+
+def matrix_params(strength=FILTER_MATRIX_STRENGTH, space=None):
+    """pytest.param per covering-array row, with a readable id, for @pytest.mark.parametrize("filters", ...).
+
+    Rows with the same category and type start from the same checkpoint, so they share a scheduling group.
+    """
+    return [
+        pytest.param(filters, id=repr(filters),
+                     marks=pytest.mark.shared_state(f"{filters.category}/{filters.type_name}"))
+        for filters in filter_matrix(strength, space)
+    ]
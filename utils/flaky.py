@@ -0,0 +1,220 @@
+import time
+import pytest
+from utils.config import FLAKY_HISTORY, FLAKY_MIN_RUNS, FLAKY_QUARANTINE_SCORE, FLAKY_RERUN_BUDGET, FLAKY_RERUNS
+from utils.logger import get_logger
+from utils.worker import base_nodeid, worker_count
+
+# pytest plugin: flaky-test handling.
+# A failing test is rerun straight away in the same process: only its function-scoped fixtures are torn down,
+# so the pooled browser, module fixtures and the API client stay warm. Reruns stop once the session's time
+# budget is spent. Every run's outcome per test (passed / failed / flaky = passed on rerun) is kept in the
+# pytest cache; tests whose recent history keeps flipping are quarantined:
+#   --flaky-lane=stable      everything except quarantined tests (the blocking CI lane)
+#   --flaky-lane=quarantine  only quarantined tests (non-blocking), which is how they earn their way back
+
+logger = get_logger(__name__)
+
+HISTORY_KEY = "flaky/history"
+LANES = ("all", "stable", "quarantine")
+# Fewer unstable events than this is a change of behaviour (e.g. one fix: fail -> pass), not flakiness
+MIN_FLAKY_EVENTS = 2
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flaky", "flaky test handling")
+    group.addoption("--flaky-lane", choices=LANES, default="all",
+                    help="run all tests, only non-quarantined ones, or only quarantined ones")
+    group.addoption("--flaky-reruns", type=int, default=FLAKY_RERUNS,
+                    help="in-process reruns of a failed test (0 disables them)")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FlakyPlugin(config), "flaky")
+
+
+def flakiness(outcomes):
+    """Score in [0, 1]: runs that passed only on rerun plus pass/fail flips between runs, per run.
+
+    A test that always fails scores 0; it is broken, not flaky. So does a single flip or rerun.
+    """
+    settled = [outcome for outcome in outcomes if outcome != "flaky"]
+    flips = sum(1 for before, after in zip(settled, settled[1:]) if before != after)
+    events = outcomes.count("flaky") + flips
+    if events < MIN_FLAKY_EVENTS:
+        return 0.0
+    return min(1.0, events / len(outcomes))
+
+
+# ---- pytest internals ----
+# Rerunning one item needs the runner's per-phase call and a fresh fixture request, which pytest does not
+# expose publicly (pytest-rerunfailures relies on the same two). They are kept here, and the pytest version
+# is pinned in requirements.txt.
+
+def _run_phase(item, when, **kwargs):
+    from _pytest.runner import call_and_report
+
+    return call_and_report(item, when, log=False, **kwargs)
+
+
+def _new_request(item):
+    if hasattr(item, "_request") and not item._request:
+        item._initrequest()
+
+
+def _drop_request(item):
+    if hasattr(item, "_request"):
+        item._request = False
+        item.funcargs = None
+
+
+# True when a module/class/session-scoped fixture of `item` failed: pytest keeps that error (in
+# FixtureDef.cached_result) until the scope ends, so a rerun would only re-raise it
+def _broken_shared_fixture(item):
+    fixture_info = getattr(item, "_fixtureinfo", None)
+    for defs in (fixture_info.name2fixturedefs.values() if fixture_info else []):
+        if not defs or defs[-1].scope == "function":
+            continue
+        cached = defs[-1].cached_result
+        if cached is not None and cached[2] is not None:
+            return True
+    return False
+
+
+class FlakyPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.lane = config.getoption("flaky_lane")
+        self.max_reruns = config.getoption("flaky_reruns")
+        self.is_worker = hasattr(config, "workerinput")
+        # The budget is per session: parallel workers split it
+        self.budget = FLAKY_RERUN_BUDGET / worker_count()
+        self.spent = 0.0
+        # History (and so quarantine) needs the pytest cache; reruns work without it
+        self.cache = getattr(config, "cache", None)
+        self.history = self.cache.get(HISTORY_KEY, {}) if self.cache else {}
+        self.quarantined = {
+            nodeid: score for nodeid, score in
+            ((nodeid, flakiness(outcomes)) for nodeid, outcomes in self.history.items()
+             if len(outcomes) >= FLAKY_MIN_RUNS)
+            if score >= FLAKY_QUARANTINE_SCORE
+        }
+        # Controller-side results of this session
+        self.failed = set()
+        self.passed = set()
+        self.rerun = {}
+
+    # ---- lanes ----
+
+    def pytest_collection_modifyitems(self, config, items):
+        if self.lane == "all":
+            return
+        keep_quarantined = self.lane == "quarantine"
+        selected, deselected = [], []
+        for item in items:
+            in_lane = (base_nodeid(item.nodeid) in self.quarantined) == keep_quarantined
+            (selected if in_lane else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        logger.info(f"Flaky lane '{self.lane}': running {len(selected)} tests, {len(self.quarantined)} quarantined")
+
+    # ---- in-process reruns ----
+
+    def _may_rerun(self, item, attempt, failed):
+        if attempt >= self.max_reruns or item.session.shouldstop or item.session.shouldfail:
+            return False
+        if failed.when == "setup" and _broken_shared_fixture(item):
+            logger.info(f"Not rerunning {item.nodeid}: a shared fixture failed and stays failed for this scope")
+            return False
+        if self.spent >= self.budget:
+            logger.warning(f"Rerun budget of {self.budget:.0f}s spent; not rerunning {item.nodeid}")
+            return False
+        return True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.max_reruns or item.config.getoption("setuponly", False):
+            return None
+
+        ihook = item.ihook
+        ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            _new_request(item)
+            reports = [_run_phase(item, "setup")]
+            if reports[0].passed:
+                reports.append(_run_phase(item, "call"))
+
+            failed = next((report for report in reports if report.failed), None)
+            if failed is not None and self._may_rerun(item, attempt, failed):
+                # Tear down only this test's own fixtures: the parent keeps module and session state warm
+                _run_phase(item, "teardown", nextitem=item.parent)
+                _drop_request(item)
+                attempt += 1
+                failed.outcome = "rerun"
+                for report in reports[:reports.index(failed) + 1]:
+                    ihook.pytest_runtest_logreport(report=report)
+                self.spent += time.monotonic() - started
+                logger.warning(f"Rerunning {item.nodeid} (attempt {attempt + 1} of {self.max_reruns + 1})")
+                continue
+
+            if item.session.shouldfail or item.session.shouldstop:
+                nextitem = None
+            reports.append(_run_phase(item, "teardown", nextitem=nextitem))
+            _drop_request(item)
+            for report in reports:
+                ihook.pytest_runtest_logreport(report=report)
+            break
+        ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    # ---- history (controller side) ----
+
+    def pytest_runtest_logreport(self, report):
+        nodeid = base_nodeid(report.nodeid)
+        if report.outcome == "rerun":
+            self.rerun[nodeid] = self.rerun.get(nodeid, 0.0) + report.duration
+        elif report.failed:
+            self.failed.add(nodeid)
+        elif report.passed and report.when == "call":
+            self.passed.add(nodeid)
+
+    def outcome(self, nodeid):
+        if nodeid in self.failed:
+            return "failed"
+        return "flaky" if nodeid in self.rerun else "passed"
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or not self.cache:
+            return
+        finished = self.failed | self.passed
+        if not finished:
+            return
+        history = dict(self.history)
+        for nodeid in finished:
+            history[nodeid] = (history.get(nodeid, []) + [self.outcome(nodeid)])[-FLAKY_HISTORY:]
+        self.cache.set(HISTORY_KEY, history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not (self.rerun or self.quarantined):
+            return
+        write = terminalreporter.write_line
+        terminalreporter.section("flaky tests")
+        if self.rerun:
+            write(f"Reruns took {sum(self.rerun.values()):.1f}s (budget {FLAKY_RERUN_BUDGET:.0f}s per session)")
+        # Only tests that passed on a rerun are flaky; failing every attempt is an ordinary failure
+        for nodeid in sorted(nodeid for nodeid in self.rerun if self.outcome(nodeid) == "flaky"):
+            write(f"  flaky: {nodeid}")
+        still_failing = sum(1 for nodeid in self.rerun if self.outcome(nodeid) == "failed")
+        if still_failing:
+            write(f"  {still_failing} rerun test(s) failed on every attempt: counted as failures, not flaky")
+        if self.quarantined:
+            write(f"Quarantined (score >= {FLAKY_QUARANTINE_SCORE}), lane '{self.lane}':")
+        for nodeid, score in sorted(self.quarantined.items(), key=lambda entry: -entry[1]):
+            write(f"  {score:.2f} {nodeid}")
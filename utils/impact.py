@@ -0,0 +1,346 @@
+import ast
+import bisect
+import hashlib
+import os
+import sys
+import threading
+import pytest
+import utils.config as config_module
+import utils.test_data as test_data_module
+from utils.logger import get_logger
+from utils.worker import base_nodeid
+
+# pytest plugin: test impact selection.
+#   --impact-record  records which project functions, locators, config values and test-data entries each test
+#                    touched, and stores that map in the pytest cache
+#   --impact         additionally runs only the tests whose recorded symbols changed since then, tests that
+#                    are not in the map yet, and the tests that failed last time
+# Anything touched during setup/teardown (fixtures, driver pool, hooks) is shared infrastructure: a change there,
+# to module-level code or to pytest.ini/requirements.txt, reruns every test.
+# Each test keeps the fingerprints it last ran against, so a partial run (--impact, -m, one file, a flaky lane)
+# only refreshes the tests it ran; a change stays visible to every test that has not run since.
+
+logger = get_logger(__name__)
+
+SOURCE_DIRS = ("pages", "utils", "tests")
+SOURCE_FILES = ("conftest.py",)
+OTHER_FILES = ("pytest.ini", "requirements.txt")
+# Modules whose top-level constants are fingerprinted value by value instead of as module code
+VALUE_MODULES = {"utils/config.py", "utils/test_data.py", "pages/locators.py"}
+MAP_KEY = "impact/map"
+INFRA_KEY = "impact/infrastructure"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "test impact selection")
+    group.addoption("--impact", action="store_true", help="run only tests affected by changes since the recorded run")
+    group.addoption("--impact-record", action="store_true", help="record which symbols every test touches")
+
+
+def pytest_configure(config):
+    if not (config.getoption("impact") or config.getoption("impact_record")):
+        return
+    # The map lives in the pytest cache (absent under -p no:cacheprovider)
+    if not hasattr(config, "cache"):
+        logger.warning("Impact selection needs the pytest cache; running everything without it")
+        return
+    config.pluginmanager.register(ImpactPlugin(config), "impact")
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:12]
+
+
+def _tracked_names():
+    config_names = {name for name in vars(config_module) if name.isupper()}
+    data_names = {name for name in vars(test_data_module) if name.isupper()}
+    return config_names, data_names
+
+
+# ---- static side: fingerprints of every symbol, and which tracked names each function refers to ----
+
+class SourceIndex:
+    def __init__(self, rootdir):
+        self.rootdir = rootdir
+        self.fingerprints = {}
+        self.references = {}
+        # path -> sorted [(first line, last line, symbol)] so code objects can be mapped back to functions
+        self.spans = {}
+        self.config_names, self.data_names = _tracked_names()
+        # Imported here: the plugin is always loaded, but only --impact runs need the locator registry
+        from pages.locators import LOCATORS
+        self.locators = LOCATORS
+        for path in self._python_files():
+            self._index_module(path)
+        self._index_values()
+        for name in OTHER_FILES:
+            path = os.path.join(rootdir, name)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self.fingerprints[f"file:{name}"] = _digest(f.read())
+
+    def _python_files(self):
+        for name in SOURCE_FILES:
+            if os.path.exists(os.path.join(self.rootdir, name)):
+                yield name
+        for directory in SOURCE_DIRS:
+            for file_name in sorted(os.listdir(os.path.join(self.rootdir, directory))):
+                if file_name.endswith(".py"):
+                    yield f"{directory}/{file_name}"
+
+    def _index_module(self, path):
+        with open(os.path.join(self.rootdir, path), encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+
+        # Plugins and conftest run around every test: their code is shared infrastructure as a whole
+        if any(isinstance(node, ast.FunctionDef) and node.name.startswith("pytest_") for node in tree.body):
+            self.fingerprints[f"module:{path}"] = _digest(ast.dump(tree))
+            return
+
+        module_code = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._index_function(path, node.name, node)
+            elif isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self._index_function(path, f"{node.name}.{child.name}", child)
+                body = [child for child in node.body if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+                module_code.append(ast.dump(ast.ClassDef(node.name, node.bases, node.keywords, body, node.decorator_list)))
+            elif not (path in VALUE_MODULES and self._assigns_constant(node)):
+                module_code.append(ast.dump(node))
+        self.fingerprints[f"module:{path}"] = _digest("\n".join(module_code))
+
+    @staticmethod
+    def _assigns_constant(node):
+        targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+        return bool(targets) and all(isinstance(t, ast.Name) and t.id.isupper() for t in targets)
+
+    def _index_function(self, path, qualname, node):
+        symbol = f"func:{path}:{qualname}"
+        self.fingerprints[symbol] = _digest(ast.dump(node))
+        first = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        bisect.insort(self.spans.setdefault(path, []), (first, node.end_lineno, symbol))
+        refs = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                name = child.id
+            elif isinstance(child, ast.Attribute):
+                name = child.attr
+            elif isinstance(child, ast.Constant) and isinstance(child.value, str):
+                name = child.value
+            else:
+                continue
+            if name in self.locators:
+                refs.add(f"locator:{name}")
+            if name in self.config_names:
+                refs.add(f"config:{name}")
+            if name in self.data_names:
+                refs.add(f"data:{name}")
+        self.references[symbol] = refs
+
+    def _index_values(self):
+        for name, value in self.locators.items():
+            self.fingerprints[f"locator:{name}"] = _digest(repr(value))
+        for name in self.config_names:
+            self.fingerprints[f"config:{name}"] = _digest(repr(getattr(config_module, name)))
+        for name in self.data_names:
+            value = getattr(test_data_module, name)
+            self.fingerprints[f"data:{name}"] = _digest(repr(value))
+            for key, entry in _entries(value):
+                self.fingerprints[f"data:{name}[{key!r}]"] = _digest(repr(entry))
+
+
+# Addressable entries of a test-data value: dict items by key, list items by value
+def _entries(value):
+    if isinstance(value, dict):
+        return list(value.items())
+    if isinstance(value, (list, tuple)):
+        return [(item, item) for item in value if isinstance(item, (str, int, float, tuple))]
+    return []
+
+
+# ---- runtime side: which project functions run while each test is in setup/call/teardown ----
+
+class CallRecorder:
+    def __init__(self, rootdir, spans):
+        self.prefix = os.path.join(rootdir, "")
+        self.spans = spans
+        self.calls = {"setup": set(), "call": set(), "teardown": set()}
+        self.phase = None
+        self._symbols = {}
+
+    def _symbol_for(self, code):
+        if not code.co_filename.startswith(self.prefix):
+            return None
+        path = os.path.relpath(code.co_filename, self.prefix).replace(os.sep, "/")
+        # Nested functions, lambdas and comprehensions count as the function whose lines contain them
+        spans = self.spans.get(path, [])
+        index = bisect.bisect_right(spans, (code.co_firstlineno, float("inf"), "")) - 1
+        if index >= 0 and spans[index][0] <= code.co_firstlineno <= spans[index][1]:
+            return spans[index][2]
+        return None
+
+    def _trace(self, frame, event, arg):
+        code = frame.f_code
+        symbol = self._symbols.get(code, False)
+        if symbol is False:
+            symbol = self._symbols[code] = self._symbol_for(code)
+        if symbol and self.phase:
+            self.calls[self.phase].add(symbol)
+        # No per-line tracing: only function entry is of interest
+        return None
+
+    def start(self):
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+
+    def stop(self):
+        sys.settrace(None)
+        threading.settrace(None)
+
+    def collect(self):
+        calls = self.calls
+        self.calls = {"setup": set(), "call": set(), "teardown": set()}
+        self.phase = None
+        return calls
+
+
+class ImpactPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.select = config.getoption("impact")
+        self.is_worker = hasattr(config, "workerinput")
+        self.index = SourceIndex(str(config.rootpath))
+        self.recorder = CallRecorder(str(config.rootpath), self.index.spans)
+        self.results = {}
+        self.infrastructure = set()
+
+    # Locators, config values and test-data entries reached through the functions a test ran
+    def _expand(self, functions, item=None):
+        symbols = set(functions)
+        for function in functions:
+            symbols |= self.index.references.get(function, set())
+        params = getattr(getattr(item, "callspec", None), "params", None)
+        if params:
+            symbols = self._narrow_data(symbols, params)
+        return symbols
+
+    # A parametrized case only depends on the test-data entries it was generated from
+    @staticmethod
+    def _narrow_data(symbols, params):
+        values = list(params.values())
+        wanted = values + [tuple(values)]
+        narrowed = set()
+        for symbol in symbols:
+            if symbol.startswith("data:") and "[" not in symbol:
+                name = symbol[len("data:"):]
+                matches = [key for key, entry in _entries(getattr(test_data_module, name, None))
+                           if key in wanted or entry in wanted]
+                if matches:
+                    narrowed.update(f"data:{name}[{key!r}]" for key in matches)
+                    continue
+            narrowed.add(symbol)
+        return narrowed
+
+    # ---- selection ----
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not self.select:
+            return
+        cache = config.cache
+        recorded = cache.get(MAP_KEY, None)
+        if not recorded:
+            logger.info("Impact selection: no recorded run yet, running everything")
+            return
+
+        current = self.index.fingerprints
+        shared = self._shared_digest(cache.get(INFRA_KEY, []))
+        # Keyed on base node ids: under --dist loadgroup xdist appends "@<group>"
+        last_failed = {base_nodeid(nodeid) for nodeid in cache.get("cache/lastfailed", {})}
+        selected, deselected, stale_shared = [], [], 0
+        for item in items:
+            nodeid = base_nodeid(item.nodeid)
+            entry = recorded.get(nodeid)
+            if not isinstance(entry, dict) or nodeid in last_failed:
+                selected.append(item)
+            elif entry["shared"] != shared:
+                stale_shared += 1
+                selected.append(item)
+            elif any(current.get(symbol) != fingerprint for symbol, fingerprint in entry["deps"].items()):
+                selected.append(item)
+            else:
+                deselected.append(item)
+        logger.info(f"Impact selection: running {len(selected)} of {len(items)} tests "
+                    f"({stale_shared} last ran against different shared code)")
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    # One digest over module-level code, other files and infrastructure symbols: what every test depends on
+    def _shared_digest(self, infrastructure):
+        fingerprints = self.index.fingerprints
+        shared = sorted(
+            (symbol, fingerprints.get(symbol)) for symbol in set(fingerprints) | set(infrastructure)
+            if symbol.startswith(("module:", "file:")) or symbol in infrastructure
+        )
+        return _digest(repr(shared))
+
+    # ---- recording ----
+
+    def pytest_sessionstart(self, session):
+        self.recorder.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self.recorder.phase = "setup"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        self.recorder.phase = "call"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        self.recorder.phase = "teardown"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "teardown":
+            return
+        calls = self.recorder.collect()
+        # user_properties carry the symbols from xdist workers to the controller
+        report.user_properties.append(("impact", {
+            "test": sorted(self._expand(calls["call"], item)),
+            "infrastructure": sorted(self._expand(calls["setup"] | calls["teardown"])),
+        }))
+
+    def pytest_runtest_logreport(self, report):
+        for name, value in report.user_properties:
+            if name == "impact":
+                self.results[base_nodeid(report.nodeid)] = value["test"]
+                self.infrastructure.update(value["infrastructure"])
+
+    def pytest_sessionfinish(self, session):
+        self.recorder.stop()
+        # A change that affects no test deselects everything: that is a pass, not "no tests collected"
+        if self.select and session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            session.exitstatus = pytest.ExitCode.OK
+        if self.is_worker or not self.results:
+            return
+        cache = session.config.cache
+        infrastructure = sorted(set(cache.get(INFRA_KEY, [])) | self.infrastructure)
+        shared = self._shared_digest(infrastructure)
+        fingerprints = self.index.fingerprints
+        # Only the tests that ran get a new snapshot; the others keep the one they last ran against
+        recorded = cache.get(MAP_KEY, {})
+        for nodeid, symbols in self.results.items():
+            recorded[nodeid] = {"deps": {symbol: fingerprints.get(symbol) for symbol in symbols}, "shared": shared}
+        cache.set(MAP_KEY, recorded)
+        cache.set(INFRA_KEY, infrastructure)
+        logger.info(f"Impact map updated for {len(self.results)} tests ({len(recorded)} recorded)")
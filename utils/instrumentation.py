@@ -0,0 +1,63 @@
+import threading
+import time
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+
+class Timings:
+    """Collects (kind, name, seconds) events for the running test, attributed to its current phase."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phase = None
+        self._events = []
+
+    def start_phase(self, phase):
+        with self._lock:
+            self.phase = phase
+
+    def record(self, kind, name, seconds, target=None):
+        with self._lock:
+            self._events.append((self.phase or "setup", kind, name, seconds, target))
+
+    # Aggregate and clear everything recorded for the test that just finished
+    def collect(self):
+        with self._lock:
+            events, self._events = self._events, []
+            self.phase = None
+
+        breakdown = {"phases": {}, "commands": {}, "locators": {}, "wait_seconds": 0.0}
+        for phase, kind, name, seconds, target in events:
+            _add(breakdown["phases"].setdefault(phase, {}), kind, seconds)
+            _add(breakdown["commands"], f"{kind}:{name}", seconds)
+            if target:
+                _add(breakdown["locators"], target, seconds)
+            if kind == "wait":
+                breakdown["wait_seconds"] += seconds
+        return breakdown
+
+
+def _add(bucket, key, seconds):
+    entry = bucket.setdefault(key, {"count": 0, "seconds": 0.0})
+    entry["count"] += 1
+    entry["seconds"] += seconds
+
+
+timings = Timings()
+
+
+def instrument_driver(driver):
+    """Time every WebDriver wire command (find, click, text, execute_script, ...) sent by this driver."""
+    executor = driver.command_executor
+    execute = executor.execute
+
+    def timed_execute(command, params):
+        start = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            target = params.get("value") if command in FIND_COMMANDS else None
+            timings.record("webdriver", command, time.perf_counter() - start, target)
+
+    executor.execute = timed_execute
+    return driver
@@ -1,30 +1,203 @@
+import atexit
+import glob
+import json
 import logging
 import os
-from utils.config import LOGS_DIR
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from utils.config import (
+    LOGS_DIR, LOG_FORMAT, LOG_ROTATION, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_CONSOLE, LOG_ITEM_LEVEL,
+)
+from utils.worker import worker_file_name
 
+LOG_FILE_NAME = "automation.log"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def get_logger(name="automation"):
-    """Create and return a configured logger instance."""
-    os.makedirs(LOGS_DIR, exist_ok=True)
-    log_file = os.path.join(LOGS_DIR, "automation.log")
 
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for machine-readable logs."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class FailureBuffer(logging.Handler):
+    """Holds per-item chatter (LOG_ITEM_LEVEL and below) for the running test; only a failure lets it through."""
+
+    def __init__(self):
+        super().__init__(logging.NOTSET)
+        self._records = []
+        self._active = False
+        self._lock_buffer = threading.Lock()
+
+    def start(self):
+        with self._lock_buffer:
+            self._records = []
+            self._active = True
+
+    def emit(self, record):
+        if record.levelno > LOG_ITEM_LEVEL or not self._active:
+            return
+        with self._lock_buffer:
+            self._records.append(record)
+
+    def drain(self):
+        with self._lock_buffer:
+            records, self._records = self._records, []
+        return records
+
+    def discard(self):
+        with self._lock_buffer:
+            self._records = []
+            self._active = False
+
+
+class LazyQueueHandler(QueueHandler):
+    """Starts the pipeline's file/console handlers on the first record, so importing a module that calls
+    get_logger() costs nothing until something is actually logged."""
+
+    def __init__(self, pipeline):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+
+    def emit(self, record):
+        self.pipeline.start()
+        super().emit(record)
+
+
+class LogPipeline:
+    """Single background writer: loggers only enqueue, one QueueListener thread does the disk/console I/O."""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = LazyQueueHandler(self)
+        # Per-item chatter is never queued directly; it waits in the failure buffer
+        self.queue_handler.addFilter(lambda record: record.levelno > LOG_ITEM_LEVEL)
+        self.failure_buffer = FailureBuffer()
+        self.handlers = []
+        self.listener = None
+        self.console = LOG_CONSOLE
+        self._start_lock = threading.Lock()
+
+    def _formatter(self):
+        if LOG_FORMAT == "json":
+            return JsonLinesFormatter()
+        return logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s", DATE_FORMAT)
+
+    def _file_handler(self):
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        # Parallel workers each write their own file (automation-gw0.log, ...), merged at session end
+        log_file = os.path.join(LOGS_DIR, worker_file_name(LOG_FILE_NAME))
+        if LOG_ROTATION == "time":
+            return TimedRotatingFileHandler(log_file, when="midnight", backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+        return RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+
+    def start(self):
+        if self.listener:
+            return
+        with self._start_lock:
+            if self.listener:
+                return
+            formatter = self._formatter()
+            handlers = [self._file_handler()]
+            if self.console:
+                handlers.append(logging.StreamHandler())
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            self.handlers = handlers
+            listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+            listener.start()
+            self.listener = listener
+
+    def stop(self):
+        if not self.listener:
+            return
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        self.listener = None
+        self.handlers = []
+
+    def set_console(self, enabled):
+        if enabled == self.console:
+            return
+        self.console = enabled
+        if self.listener:
+            self.stop()
+            self.start()
+
+    # Test hooks: buffer per-item records during a test, write them only if it failed
+    def begin_test(self):
+        self.failure_buffer.start()
+
+    def test_failed(self):
+        self.start()
+        for record in self.failure_buffer.drain():
+            self.queue_handler.enqueue(self.queue_handler.prepare(record))
+
+    def end_test(self):
+        self.failure_buffer.discard()
+
+
+pipeline = LogPipeline()
+atexit.register(pipeline.stop)
+
+
+def get_logger(name="automation"):
+    """Create and return a configured logger instance (handlers start with its first record)."""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    # DEBUG reaches the failure buffer; the queue only carries records above LOG_ITEM_LEVEL
+    logger.setLevel(logging.DEBUG)
 
     # Prevent duplicate log handlers
     if not logger.handlers:
-        file_handler = logging.FileHandler(log_file, mode="a")
-        console_handler = logging.StreamHandler()
+        logger.addHandler(pipeline.queue_handler)
+        logger.addHandler(pipeline.failure_buffer)
 
-        formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-            "%Y-%m-%d %H:%M:%S"
-        )
+    return logger
 
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+# Fold the per-worker files of a parallel run into logs/automation.log, ordered by timestamp
+def merge_worker_logs():
+    worker_files = sorted(glob.glob(os.path.join(LOGS_DIR, "automation-gw*.log")))
+    if not worker_files:
+        return
 
-    return logger
+    entries = []
+    for order, file_path in enumerate(worker_files):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                if entries and entries[-1][2] == order and not _starts_record(line):
+                    # Continuation line (traceback, multi-line message) stays with its record
+                    entries[-1][3].append(line)
+                else:
+                    entries.append([_timestamp(line), len(entries), order, [line]])
+
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    with open(os.path.join(LOGS_DIR, LOG_FILE_NAME), "a", encoding="utf-8") as merged:
+        for entry in entries:
+            merged.writelines(entry[3])
+    for file_path in worker_files:
+        os.remove(file_path)
+
+
+def _starts_record(line):
+    return line.startswith("{") or line[:4].isdigit()
+
+
+def _timestamp(line):
+    if line.startswith("{"):
+        try:
+            return json.loads(line).get("time", "")
+        except ValueError:
+            return ""
+    return line[:19]
@@ -0,0 +1,113 @@
+import ast
+import re
+from utils.logger import get_logger
+
+# pytest plugin: skip importing test modules that `-m` can never select.
+# The lane marks (api/ui) are only ever applied through a module-level `pytestmark`, so reading that assignment
+# from the parsed source tells exactly which lane a module is in. When the -m expression is built from lane marks alone
+# (`api`, `not ui`, `api or ui`, ...) and the module's lane does not satisfy it, the module is not collected at
+# all, so e.g. `pytest -m api` never imports the UI tests and the selenium/page-object stack behind them.
+# Any other mark can also come from elsewhere (pytest.param marks, plugin hooks), so an expression that names
+# one, or that this small parser does not understand, leaves collection to pytest.
+
+logger = get_logger(__name__)
+
+LANE_MARKS = {"api", "ui"}
+
+
+# Mark names in a `pytestmark` value made only of pytest.mark.<name>[(...)] / mark.<name>, lists and tuples;
+# None for anything else (a variable, a function call building the marks, ...)
+def _mark_names(value):
+    if isinstance(value, (ast.List, ast.Tuple)):
+        names = set()
+        for element in value.elts:
+            element_names = _mark_names(element)
+            if element_names is None:
+                return None
+            names |= element_names
+        return names
+    if isinstance(value, ast.Call):
+        value = value.func
+    if isinstance(value, ast.Attribute):
+        owner = value.value
+        if isinstance(owner, ast.Name) and owner.id == "mark":
+            return {value.attr}
+        if isinstance(owner, ast.Attribute) and owner.attr == "mark" \
+                and isinstance(owner.value, ast.Name) and owner.value.id == "pytest":
+            return {value.attr}
+    return None
+
+
+def module_lane_marks(source):
+    """Lane marks declared by a module's `pytestmark`, or None when it declares none or they cannot be read."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    names = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            targets = [node.target]
+        else:
+            continue
+        if not any(isinstance(target, ast.Name) and target.id == "pytestmark" for target in targets):
+            continue
+        assigned = _mark_names(node.value) if node.value is not None else None
+        if assigned is None:
+            return None
+        names = assigned if isinstance(node, ast.Assign) else (names or set()) | assigned
+    return None if names is None else names & LANE_MARKS
+
+
+def parse_lane_expression(markexpr):
+    """Compile `name`, `not`, `and`, `or` (no parentheses) over lane marks into marks -> bool, else None."""
+    tokens = markexpr.split()
+    if not tokens or any(not re.fullmatch(r"\w+", token) for token in tokens):
+        return None
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def operand():
+        if peek() == "not":
+            take()
+            inner = operand()
+            return inner and (lambda marks: not inner(marks))
+        name = take() if peek() not in (None, "and", "or") else None
+        if name not in LANE_MARKS:
+            return None
+        return lambda marks: name in marks
+
+    def chain(parse_part, operator, combine):
+        parts = [parse_part()]
+        while peek() == operator and None not in parts:
+            take()
+            parts.append(parse_part())
+        if None in parts:
+            return None
+        return parts[0] if len(parts) == 1 else (lambda marks: combine(part(marks) for part in parts))
+
+    expression = chain(lambda: chain(operand, "and", all), "or", any)
+    return expression if position == len(tokens) else None
+
+
+def pytest_ignore_collect(collection_path, config):
+    markexpr = config.option.markexpr
+    if not markexpr or collection_path.suffix != ".py" or not collection_path.name.startswith("test_"):
+        return None
+    expression = parse_lane_expression(markexpr)
+    if expression is None:
+        return None
+    marks = module_lane_marks(collection_path.read_text(encoding="utf-8"))
+    if marks is None or expression(marks):
+        return None
+    logger.info(f"Not collecting {collection_path.name}: no test in it can match -m '{markexpr}'")
+    return True
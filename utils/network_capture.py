@@ -0,0 +1,138 @@
+import base64
+import json
+import re
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qsl, urlsplit
+from selenium.common.exceptions import WebDriverException
+from utils.config import NETWORK_CAPTURE_BUFFER, NETWORK_CAPTURE_URL
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CapturedResponse:
+    """One TMDB list/discover JSON body as the app received it."""
+
+    def __init__(self, sequence, url, status, payload):
+        self.sequence = sequence
+        self.url = url
+        self.status = status
+        self.payload = payload
+        self.received = time.time()
+
+    @property
+    def media(self):
+        return "tv" if re.search(r"/tv\b", self.url) else "movie"
+
+    @property
+    def params(self):
+        return dict(parse_qsl(urlsplit(self.url).query))
+
+    # True when the request carried every one of `params` (compared as strings) for `media`
+    def matches(self, params, media=None):
+        if media and media != self.media:
+            return False
+        return all(self.params.get(name) == str(value) for name, value in params.items())
+
+    # Structured results: id, title, release date, year, vote average and genre ids per item
+    def movies(self):
+        movies = []
+        for item in self.payload.get("results", []):
+            release_date = item.get("release_date") or item.get("first_air_date") or ""
+            movies.append({
+                "id": item.get("id"),
+                "title": item.get("title") or item.get("name"),
+                "release_date": release_date,
+                "year": int(release_date[:4]) if release_date[:4].isdigit() else None,
+                "vote_average": item.get("vote_average"),
+                "genre_ids": item.get("genre_ids", []),
+            })
+        return movies
+
+    def __repr__(self):
+        return f"CapturedResponse(#{self.sequence} {self.status} {self.url})"
+
+
+class NetworkCapture:
+    """Buffers matching JSON responses from Chrome's performance log (DevTools Network events).
+
+    Bodies are fetched with Network.getResponseBody as soon as loadingFinished is seen, so callers can
+    read what the app fetched without waiting for the grid to render. Needs the "performance" log
+    enabled on the driver (see utils/driver_factory.py).
+    """
+
+    def __init__(self, driver, url_pattern=NETWORK_CAPTURE_URL, max_responses=NETWORK_CAPTURE_BUFFER):
+        self.driver = driver
+        self.url_pattern = re.compile(url_pattern)
+        self.responses = deque(maxlen=max_responses)
+        self.sequence = 0
+        # requestId -> [url, status] for matching requests that have not finished loading
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _events(self):
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException as e:
+            logger.warning(f"Could not read the performance log: {e.msg}")
+            return
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            yield message["method"], message.get("params", {})
+
+    def _body(self, request_id):
+        result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        body = result["body"]
+        return base64.b64decode(body) if result.get("base64Encoded") else body
+
+    # Drain the performance log into the buffer; returns how many responses were added
+    def poll(self):
+        added = 0
+        with self._lock:
+            for method, params in self._events():
+                request_id = params.get("requestId")
+                if method == "Network.requestWillBeSent":
+                    if self.url_pattern.search(params["request"]["url"]):
+                        self._in_flight[request_id] = [params["request"]["url"], None]
+                elif method == "Network.responseReceived" and request_id in self._in_flight:
+                    self._in_flight[request_id][1] = params["response"]["status"]
+                elif method == "Network.loadingFailed":
+                    self._in_flight.pop(request_id, None)
+                elif method == "Network.loadingFinished" and request_id in self._in_flight:
+                    url, status = self._in_flight.pop(request_id)
+                    try:
+                        payload = json.loads(self._body(request_id))
+                    except (WebDriverException, ValueError) as e:
+                        # Body evicted (page navigated away) or not JSON after all
+                        logger.warning(f"Could not read captured body of {url}: {e}")
+                        continue
+                    self.sequence += 1
+                    self.responses.append(CapturedResponse(self.sequence, url, status, payload))
+                    added += 1
+        return added
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    # Sequence number to pass as `since`: only responses captured after this call count
+    def mark(self):
+        self.poll()
+        return self.sequence
+
+    # Newest response after `since`, optionally only one that `matching(response)` accepts
+    def latest(self, since=0, matching=None):
+        self.poll()
+        return next((
+            response for response in reversed(self.responses)
+            if response.sequence > since and (matching is None or matching(response))
+        ), None)
+
+    # Forget everything seen so far (pooled drivers start each test with an empty buffer)
+    def clear(self):
+        self.poll()
+        with self._lock:
+            self.responses.clear()
+            self._in_flight.clear()
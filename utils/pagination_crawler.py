@@ -0,0 +1,153 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.config import CRAWL_PAGE_BUDGET, CRAWL_UI_CONCURRENCY
+from utils.logger import get_logger
+from utils.schema import PageValidator
+
+logger = get_logger(__name__)
+
+API_PAGE_VALIDATOR = PageValidator()
+# TMDB refuses page numbers above 500 regardless of total_pages
+TMDB_MAX_PAGE = 500
+
+
+class PageResult:
+    """Outcome of validating one results page."""
+
+    def __init__(self, page, keys=(), errors=None, seconds=0.0):
+        self.page = page
+        self.keys = list(keys)
+        self.errors = errors or []
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        status = "ok" if self.ok else "; ".join(self.errors)
+        return f"page {self.page}: {len(self.keys)} items in {self.seconds * 1000:.0f} ms ({status})"
+
+
+class CrawlReport:
+    """Per-page results plus duplicates across pages, filled in as pages arrive."""
+
+    def __init__(self, total_pages):
+        self.total_pages = total_pages
+        self.pages = {}
+        self.first_seen = {}
+        self.duplicates = []
+
+    def add(self, result):
+        for key in result.keys:
+            if key in self.first_seen and self.first_seen[key] != result.page:
+                self.duplicates.append((key, self.first_seen[key], result.page))
+            else:
+                self.first_seen.setdefault(key, result.page)
+        self.pages[result.page] = result
+
+    @property
+    def failed_pages(self):
+        return sorted(page for page, result in self.pages.items() if not result.ok)
+
+    def summary(self):
+        lines = [repr(self.pages[page]) for page in sorted(self.pages)]
+        lines.append(f"{len(self.pages)}/{self.total_pages} pages crawled, "
+                     f"{len(self.failed_pages)} failed, {len(self.duplicates)} duplicate items")
+        return "\n".join(lines)
+
+
+def _stream(report, result, on_page):
+    report.add(result)
+    logger.info(f"Crawled {result!r}")
+    if on_page:
+        on_page(result)
+
+
+# ---- API: every page of /movie/{category}, fetched concurrently ----
+
+def _check_api_page(page, response, seconds):
+    if response.status_code != 200:
+        return PageResult(page, errors=[f"HTTP {response.status_code}"], seconds=seconds)
+    data = response.json()
+    movies = data.get("results") or []
+    errors = [] if movies else ["no results"]
+    violations = API_PAGE_VALIDATOR.validate_page(data).violations
+    errors += [f"{field} [{rule}]: {ids}" for (field, rule), ids in sorted(violations.items())]
+    return PageResult(page, [movie.get("id") for movie in movies], errors, seconds)
+
+
+def crawl_api(client, category="popular", budget=CRAWL_PAGE_BUDGET, on_page=None):
+    """Validate pages 1..min(total_pages, budget) of /movie/{category}; time scales with pages / connections."""
+    start = time.perf_counter()
+    first = client.get_movie_list(category, 1)
+    total_pages = first.json().get("total_pages", 1) if first.status_code == 200 else 1
+    report = CrawlReport(min(total_pages, budget, TMDB_MAX_PAGE))
+    _stream(report, _check_api_page(1, first, time.perf_counter() - start), on_page)
+
+    pages = list(range(2, report.total_pages + 1))
+
+    def fetch(page):
+        page_start = time.perf_counter()
+        response = client.get_movie_list(category, page)
+        return response, time.perf_counter() - page_start
+
+    for index, (response, seconds) in client.iter_concurrently([lambda page=page: fetch(page) for page in pages]):
+        _stream(report, _check_api_page(pages[index], response, seconds), on_page)
+    return report
+
+
+# ---- UI: contiguous page ranges walked by pooled browsers in parallel ----
+
+def _check_ui_page(page, cards, seconds):
+    errors = []
+    if not cards:
+        errors.append("no movie titles")
+    for card in cards:
+        if not card["title"]:
+            errors.append("card with empty title")
+        if card["year"] is None or not card["year"].isdigit():
+            errors.append(f"'{card['title']}' has no release year")
+    # The grid exposes no ids, so title + year identifies a movie across pages
+    return PageResult(page, [(card["title"], card["year"]) for card in cards], errors, seconds)
+
+
+def crawl_ui(driver_pool, page_factory, budget=CRAWL_PAGE_BUDGET, concurrency=CRAWL_UI_CONCURRENCY, on_page=None):
+    """Validate paginator pages 1..min(last page, budget), split into contiguous ranges across pooled drivers."""
+    driver = driver_pool.acquire()
+    try:
+        home = page_factory(driver)
+        home.wait_for_pagination()
+        total_pages = min(max(home.get_visible_page_numbers() or [1]), budget)
+    finally:
+        driver_pool.release(driver)
+
+    report = CrawlReport(total_pages)
+    pages = list(range(1, total_pages + 1))
+    chunk = -(-len(pages) // max(1, concurrency))
+    ranges = [pages[i:i + chunk] for i in range(0, len(pages), chunk)]
+
+    def walk(page_range):
+        driver = driver_pool.acquire()
+        try:
+            home = page_factory(driver)
+            for page in page_range:
+                page_start = time.perf_counter()
+                try:
+                    home.go_to_page(page)
+                    cards = home.snapshot_results()
+                    result = _check_ui_page(page, cards, time.perf_counter() - page_start)
+                except Exception as e:
+                    result = PageResult(page, errors=[f"{type(e).__name__}: {e}"],
+                                        seconds=time.perf_counter() - page_start)
+                with lock:
+                    _stream(report, result, on_page)
+        finally:
+            driver_pool.release(driver)
+
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="crawl") as executor:
+        for future in as_completed([executor.submit(walk, page_range) for page_range in ranges]):
+            future.result()
+    return report
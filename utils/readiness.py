@@ -0,0 +1,57 @@
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Counts in-flight fetch/XHR calls and timestamps DOM mutations, so waits can poll page state
+READINESS_SCRIPT = """
+(function () {
+  if (window.__readiness) { return; }
+  var state = window.__readiness = {
+    inflight: 0, lastNetwork: Date.now(), lastMutation: Date.now(), watched: {}
+  };
+  var started = function () { state.inflight++; state.lastNetwork = Date.now(); };
+  var finished = function () { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = Date.now(); };
+
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+      started();
+      return originalFetch.apply(this, arguments).finally(finished);
+    };
+  }
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    started();
+    this.addEventListener('loadend', finished);
+    return originalSend.apply(this, arguments);
+  };
+
+  // Remember the last mutation inside every watched XPath root (e.g. the movie grid)
+  var inWatched = function (node, xpath) {
+    var root = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return root && (root.contains(node) || node.contains(root));
+  };
+  var observe = function () {
+    new MutationObserver(function (records) {
+      var now = Date.now();
+      state.lastMutation = now;
+      Object.keys(state.watched).forEach(function (xpath) {
+        if (records.some(function (r) { return inWatched(r.target, xpath); })) {
+          state.watched[xpath] = now;
+        }
+      });
+    }).observe(document, {childList: true, subtree: true, characterData: true});
+  };
+  observe();
+})();
+"""
+
+
+def install_readiness_probe(driver):
+    """Inject the readiness probe into every document the browser loads from now on."""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_SCRIPT})
+    except (AttributeError, WebDriverException) as e:
+        # Non-Chromium drivers fall back to injecting it on demand from BasePage
+        logger.warning(f"Could not register readiness probe via CDP: {e}")
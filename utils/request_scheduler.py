@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from utils.config import (
+    API_RATE_LIMIT, API_BURST, API_MAX_IN_FLIGHT, API_TIMEOUT, API_MAX_RETRIES, API_BACKOFF_BASE, API_BACKOFF_MAX,
+)
+from utils.instrumentation import timings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average and up to `burst` at once; rate <= 0 means unlimited."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # Take a token if one is available; otherwise return how long to wait before trying again
+    def try_acquire(self):
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    # The server said "slow down": nobody gets a token until it has had its break
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            # Refill starts when the break ends, not from the last acquisition
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+
+def retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """Throttles, caps and retries HTTP calls so concurrent suites stay just under the server's rate limit.
+
+    Every attempt takes a token from the bucket and a slot from the in-flight cap. 429 and 5xx
+    responses (and connection errors / timeouts) are retried with jittered exponential backoff,
+    or after Retry-After when the server sends one.
+    """
+
+    def __init__(self, rate=API_RATE_LIMIT, burst=API_BURST, max_in_flight=API_MAX_IN_FLIGHT, timeout=API_TIMEOUT,
+                 max_retries=API_MAX_RETRIES, backoff_base=API_BACKOFF_BASE, backoff_max=API_BACKOFF_MAX):
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    # Full jitter: a uniform delay up to the exponential ceiling keeps retrying clients from moving in lockstep
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def send(self, request, description=""):
+        """Run request(timeout) -> Response with throttling and retries; returns the last response."""
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            if waited:
+                timings.record("throttle", description, waited)
+
+            try:
+                with self.in_flight:
+                    response = request(self.timeout)
+            except RETRY_EXCEPTIONS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"{description} failed ({type(e).__name__}); retry {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                if retry_after > self.backoff_max:
+                    # An hour-long Retry-After would stall every thread sharing the bucket; retry sooner instead
+                    logger.warning(f"{description}: Retry-After {retry_after:.0f}s capped at {self.backoff_max:.0f}s")
+                    retry_after = self.backoff_max
+                delay = retry_after + random.uniform(0, self.backoff_base)
+            else:
+                delay = self.backoff(attempt)
+            if response.status_code == 429:
+                self.bucket.pause(delay)
+            logger.warning(f"{description} -> {response.status_code}; retry {attempt + 1} in {delay:.2f}s")
+            time.sleep(delay)
+        return response
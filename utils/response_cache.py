@@ -0,0 +1,191 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils.config import API_CACHE, API_CACHE_SIZE, API_CACHE_DIR, API_CACHE_TTL, API_CACHE_TTLS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Query parameters that never change the payload (the key is a credential; keep it out of keys and files)
+IGNORED_PARAMS = {"api_key"}
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+API_KEY_PARAM = re.compile(r"([?&])api_key=[^&]*&?")
+
+
+class CacheStats:
+    """Hit / miss / revalidation counts of one cache (the session total, on the controller under xdist)."""
+
+    FIELDS = ("hits", "misses", "revalidated", "stored")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, field, count=1):
+        with self._lock:
+            self.counts[field] += count
+
+    def merge(self, counts):
+        for field in self.FIELDS:
+            self.add(field, counts.get(field, 0))
+
+    def summary(self):
+        counts = self.counts
+        lookups = counts["hits"] + counts["misses"] + counts["revalidated"]
+        served = counts["hits"] + counts["revalidated"]
+        ratio = served / lookups * 100 if lookups else 0.0
+        return (f"{counts['hits']} hits, {counts['revalidated']} revalidated (304), {counts['misses']} misses, "
+                f"{counts['stored']} stored; {ratio:.0f}% of {lookups} requests served from cache")
+
+
+def cache_key(url, params):
+    query = sorted((k, str(v)) for k, v in (params or {}).items() if k not in IGNORED_PARAMS and v is not None)
+    return f"GET {url}?{urlencode(query)}"
+
+
+class CachedEntry:
+    def __init__(self, url, status_code, headers, content, stored_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, response):
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        return cls(response.url, response.status_code, headers, response.content, time.time())
+
+    def to_response(self):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers["X-Cache"] = "HIT"
+        response._content = self.content
+        response.url = self.url
+        response.encoding = "utf-8"
+        response.reason = "OK"
+        return response
+
+    # If-None-Match / If-Modified-Since for a stale entry, when the server gave us validators
+    def conditional_headers(self):
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_json(self):
+        return {
+            "url": API_KEY_PARAM.sub(r"\1", self.url).rstrip("?&"),
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "content": base64.b64encode(self.content).decode("ascii"),
+            "stored_at": self.stored_at,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["url"], data["status_code"], data["headers"], base64.b64decode(data["content"]), data["stored_at"])
+
+
+class ResponseCache:
+    """In-memory LRU of successful GET responses, optionally backed by one JSON file per entry on disk."""
+
+    def __init__(self, max_entries=API_CACHE_SIZE, disk_dir=None, default_ttl=API_CACHE_TTL, ttls=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.default_ttl = default_ttl
+        # Longest matching path prefix wins, e.g. {"genre/": 86400, "movie/": 600}
+        self.ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Counted by the client using this cache, so throwaway caches never touch the session report
+        self.stats = CacheStats()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def ttl_for(self, path):
+        path = path.lstrip("/")
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, entry, path):
+        return time.time() - entry.stored_at < self.ttl_for(path)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._load(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        self._save(key, entry)
+
+    # A 304 confirms the stored body; restart its TTL
+    def refresh(self, key, entry):
+        entry.stored_at = time.time()
+        self.put(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".json")
+
+    def _load(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return CachedEntry.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry.to_json(), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+
+
+def build_response_cache():
+    """ResponseCache configured by API_CACHE ("memory", "disk" or "off"); None when caching is off."""
+    if API_CACHE == "off":
+        return None
+    disk_dir = API_CACHE_DIR if API_CACHE == "disk" else None
+    return ResponseCache(API_CACHE_SIZE, disk_dir, API_CACHE_TTL, API_CACHE_TTLS)
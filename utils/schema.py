@@ -0,0 +1,139 @@
+import re
+from collections import defaultdict
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MISSING = object()
+
+
+# ---- rules: (name, predicate(value) -> bool). MISSING is passed for absent fields ----
+
+def required():
+    return "required", lambda value: value is not MISSING
+
+
+def of_type(*types):
+    names = "|".join(t.__name__ for t in types)
+    # bool is an int subclass; never accept it where a number is expected
+    return f"type:{names}", lambda value: value is MISSING or (isinstance(value, types) and not isinstance(value, bool))
+
+
+def non_empty():
+    return "non_empty", lambda value: value is MISSING or bool(str(value).strip())
+
+
+def between(minimum=None, maximum=None):
+    def check(value):
+        if value is MISSING or not isinstance(value, (int, float)):
+            return True
+        return (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+    return f"between:{minimum}..{maximum}", check
+
+
+def year_between(start_year, end_year):
+    # An empty or malformed date cannot be in range; report it instead of crashing on int("")
+    def check(value):
+        if value is MISSING:
+            return True
+        return bool(DATE_PATTERN.match(str(value))) and start_year <= int(value[:4]) <= end_year
+    return f"year_between:{start_year}..{end_year}", check
+
+
+# ---- declared schemas: field -> rules ----
+
+MOVIE = {
+    "id": [required(), of_type(int)],
+    "title": [required(), of_type(str), non_empty()],
+    "release_date": [required(), of_type(str)],
+    "vote_average": [required(), of_type(int, float), between(0, 10)],
+    "genre_ids": [of_type(list)],
+    "popularity": [of_type(int, float)],
+}
+
+MOVIE_PAGE = {
+    "page": [required(), of_type(int), between(1, 500)],
+    "results": [required(), of_type(list)],
+    "total_pages": [required(), of_type(int)],
+    "total_results": [required(), of_type(int)],
+}
+
+
+def _compile(schema):
+    checks = tuple((field, name, predicate) for field, rules in schema.items() for name, predicate in rules)
+
+    def validate(item):
+        get = item.get
+        return [(field, name) for field, name, predicate in checks if not predicate(get(field, MISSING))]
+
+    return validate
+
+
+class ViolationReport:
+    """Violations aggregated as (field, rule) -> offending ids, across every item validated."""
+
+    def __init__(self):
+        self.violations = defaultdict(list)
+        self.items = 0
+        self.pages = 0
+
+    def add(self, field, rule, item_id):
+        self.violations[(field, rule)].append(item_id)
+
+    @property
+    def ok(self):
+        return not self.violations
+
+    def summary(self, max_ids=10):
+        if self.ok:
+            return f"{self.items} items on {self.pages} pages: no violations"
+        lines = [f"{self.items} items on {self.pages} pages, {sum(map(len, self.violations.values()))} violations:"]
+        for (field, rule), ids in sorted(self.violations.items()):
+            shown = ", ".join(str(i) for i in ids[:max_ids]) + (" ..." if len(ids) > max_ids else "")
+            lines.append(f"  {field} [{rule}] x{len(ids)}: {shown}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+class PageValidator:
+    """Compiled once from a page schema and an item schema (plus per-request rules); validates pages in one pass."""
+
+    def __init__(self, page_schema=MOVIE_PAGE, item_schema=MOVIE, extra_item_rules=None):
+        item_schema = {field: list(rules) for field, rules in item_schema.items()}
+        for field, rules in (extra_item_rules or {}).items():
+            item_schema.setdefault(field, []).extend(rules)
+        self._validate_page = _compile(page_schema)
+        self._validate_item = _compile(item_schema)
+
+    def validate_page(self, payload, report=None):
+        report = report or ViolationReport()
+        report.pages += 1
+        page_id = f"page {payload.get('page', '?')}"
+        for field, rule in self._validate_page(payload):
+            report.add(field, rule, page_id)
+
+        results = payload.get("results")
+        for position, item in enumerate(results if isinstance(results, list) else []):
+            report.items += 1
+            if not isinstance(item, dict):
+                report.add("results", "object", f"{page_id} #{position}")
+                continue
+            for field, rule in self._validate_item(item):
+                report.add(field, rule, item.get("id", page_id))
+        return report
+
+    def validate_stream(self, payloads, report=None):
+        report = report or ViolationReport()
+        for payload in payloads:
+            self.validate_page(payload, report)
+        return report
+
+
+# Validators for the filters the tests apply
+def discover_validator(start_year=None, end_year=None, vote_min=None, vote_max=None):
+    extra = {}
+    if start_year is not None or end_year is not None:
+        extra["release_date"] = [year_between(start_year or 0, end_year or 9999)]
+    if vote_min is not None or vote_max is not None:
+        extra["vote_average"] = [between(vote_min, vote_max)]
+    return PageValidator(extra_item_rules=extra)
@@ -0,0 +1,293 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+from utils.config import (
+    LIVE_BASE_URL, LIVE_TMDB_API_URL, STUB_FIXTURES_DIR, STUB_HOST, STUB_LATENCY_MS, STUB_PORT, STUB_RATE_LIMIT,
+    TMDB_API_KEY,
+)
+from utils.logger import get_logger
+from utils.request_scheduler import TokenBucket
+
+logger = get_logger(__name__)
+
+API_PREFIX = "/3/"
+PAGE_SIZE = 20
+MAX_PAGES = 500
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "application/x-javascript")
+# Query parameters that never change the response and must not split recordings
+IGNORED_PARAMS = {"api_key", "language"}
+# Date parameter names per discover media type
+DATE_FIELDS = {"movie": "release_date", "tv": "first_air_date"}
+SORT_FIELDS = {
+    "popularity": "popularity",
+    "vote_average": "vote_average",
+    "vote_count": "vote_count",
+    "release_date": "release_date",
+    "primary_release_date": "release_date",
+    "first_air_date": "first_air_date",
+    "title": "title",
+    "original_title": "original_title",
+}
+
+
+class FixtureStore:
+    """Recorded responses on disk, keyed by path plus canonical query string."""
+
+    def __init__(self, root=STUB_FIXTURES_DIR):
+        self.root = root
+        self.responses_dir = os.path.join(root, "responses")
+        self.catalogue_dir = os.path.join(root, "catalogue")
+        self._lock = threading.Lock()
+        self._catalogues = {}
+
+    @staticmethod
+    def request_key(path, query):
+        params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in IGNORED_PARAMS)
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def _file_for(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.responses_dir, f"{digest}.json")
+
+    def load(self, key):
+        file_path = self._file_for(key)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, encoding="utf-8") as f:
+            entry = json.load(f)
+        body = base64.b64decode(entry["body"]) if entry.get("base64") else entry["body"].encode("utf-8")
+        return entry["status"], entry["content_type"], body
+
+    def save(self, key, status, content_type, body):
+        is_text = content_type.startswith(TEXT_TYPES)
+        entry = {
+            "key": key,
+            "status": status,
+            "content_type": content_type,
+            "base64": not is_text,
+            "body": body.decode("utf-8") if is_text else base64.b64encode(body).decode("ascii"),
+        }
+        os.makedirs(self.responses_dir, exist_ok=True)
+        with self._lock, open(self._file_for(key), "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=1)
+
+    # Every recorded list of movies/shows feeds the catalogue that /discover is answered from
+    def catalogue(self, media):
+        with self._lock:
+            if media not in self._catalogues:
+                file_path = os.path.join(self.catalogue_dir, f"{media}.json")
+                items = {}
+                if os.path.exists(file_path):
+                    with open(file_path, encoding="utf-8") as f:
+                        items = {str(item["id"]): item for item in json.load(f)}
+                self._catalogues[media] = items
+            return self._catalogues[media]
+
+    def add_to_catalogue(self, media, results):
+        items = self.catalogue(media)
+        with self._lock:
+            for item in results:
+                if "id" in item:
+                    items[str(item["id"])] = item
+            os.makedirs(self.catalogue_dir, exist_ok=True)
+            with open(os.path.join(self.catalogue_dir, f"{media}.json"), "w", encoding="utf-8") as f:
+                json.dump(list(items.values()), f, indent=1)
+
+
+# Answer /discover/{media} by filtering the recorded catalogue with TMDB's query semantics
+def discover(items, media, params):
+    date_field = DATE_FIELDS.get(media, "release_date")
+    results = list(items)
+
+    date_gte = params.get(f"{date_field}.gte") or params.get("primary_release_date.gte")
+    date_lte = params.get(f"{date_field}.lte") or params.get("primary_release_date.lte")
+    if date_gte:
+        results = [r for r in results if r.get(date_field) and r[date_field] >= date_gte]
+    if date_lte:
+        results = [r for r in results if r.get(date_field) and r[date_field] <= date_lte]
+
+    if params.get("vote_average.gte"):
+        results = [r for r in results if r.get("vote_average", 0) >= float(params["vote_average.gte"])]
+    if params.get("vote_average.lte"):
+        results = [r for r in results if r.get("vote_average", 0) <= float(params["vote_average.lte"])]
+
+    # "28,12" means all genres, "28|12" means any of them
+    genres = params.get("with_genres")
+    if genres:
+        if "|" in genres:
+            wanted = {int(g) for g in genres.split("|")}
+            results = [r for r in results if wanted & set(r.get("genre_ids", []))]
+        else:
+            wanted = {int(g) for g in genres.split(",")}
+            results = [r for r in results if wanted <= set(r.get("genre_ids", []))]
+
+    field, _, direction = params.get("sort_by", "popularity.desc").partition(".")
+    key = SORT_FIELDS.get(field, "popularity")
+    # Items without the field (None or "", e.g. an unreleased movie's date) go last in either direction
+    present = [r for r in results if r.get(key) not in (None, "")]
+    missing = [r for r in results if r.get(key) in (None, "")]
+    results = sorted(present, key=lambda r: r[key], reverse=direction != "asc") + missing
+
+    page = int(params.get("page", 1))
+    if not 1 <= page <= MAX_PAGES:
+        raise ValueError(f"page must be between 1 and {MAX_PAGES}, got {page}")
+    total_pages = min(MAX_PAGES, (len(results) + PAGE_SIZE - 1) // PAGE_SIZE)
+    return {
+        "page": page,
+        "results": results[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+        "total_pages": total_pages,
+        "total_results": len(results),
+    }
+
+
+# A TMDB-style error body for API paths, plain text for site paths
+def error_response(parts, status, message, status_code=None):
+    if not parts.path.startswith(API_PREFIX):
+        return status, "text/plain", message.encode("utf-8")
+    payload = {"success": False, "status_code": status_code, "status_message": message}
+    return status, "application/json;charset=utf-8", json.dumps(payload).encode("utf-8")
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server_version = "TMDBStub/1.0"
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        parts = urlsplit(self.path)
+        if parts.path.startswith(API_PREFIX) and self.server.rate_limited():
+            return self.send_rate_limited()
+
+        key = self.server.store.request_key(parts.path, parts.query)
+        if self.server.mode == "record":
+            status, content_type, body = self.server.record(parts, key)
+        else:
+            status, content_type, body = self.server.replay(parts, key)
+
+        if content_type.startswith(TEXT_TYPES):
+            # The web app talks to TMDB directly; point it at the stand-in instead
+            body = body.replace(LIVE_TMDB_API_URL.encode(), f"{self.server.url}/3".encode())
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    # What TMDB answers when a client goes over its request rate
+    def send_rate_limited(self):
+        body = json.dumps({
+            "success": False,
+            "status_code": 25,
+            "status_message": "Your request count is over the allowed limit.",
+        }).encode("utf-8")
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"stub {self.address_string()} {format % args}")
+
+
+class StubServer(ThreadingHTTPServer):
+    """In-process stand-in for the TMDB API and the demo site, serving recorded fixtures."""
+
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent clients
+    request_queue_size = 128
+
+    def __init__(self, mode="replay", host=STUB_HOST, port=STUB_PORT, latency_ms=STUB_LATENCY_MS, store=None,
+                 rate_limit=STUB_RATE_LIMIT):
+        super().__init__((host, port), StubRequestHandler)
+        self.mode = mode
+        self.url = f"http://{host}:{self.server_port}"
+        self.latency = latency_ms / 1000
+        self.limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+        self.store = store or FixtureStore()
+        self.upstream = requests.Session()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="tmdb-stub", daemon=True)
+        self._thread.start()
+        logger.info(f"TMDB stand-in ({self.mode}) listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.upstream.close()
+
+    def rate_limited(self):
+        return self.limiter is not None and self.limiter.try_acquire() > 0
+
+    def replay(self, parts, key):
+        recorded = self.store.load(key)
+        if recorded:
+            return recorded
+
+        if parts.path.startswith(f"{API_PREFIX}discover/"):
+            media = parts.path.rsplit("/", 1)[-1]
+            params = dict(parse_qsl(parts.query))
+            try:
+                payload = discover(self.store.catalogue(media).values(), media, params)
+            except ValueError as e:
+                # TMDB answers malformed query values (e.g. page=abc) with 422
+                return error_response(parts, 422, f"Invalid parameters: {e}", status_code=22)
+            return 200, "application/json;charset=utf-8", json.dumps(payload).encode("utf-8")
+
+        logger.warning(f"No recording for {key}")
+        return error_response(parts, 404, f"Not recorded: {key}", status_code=34)
+
+    # Proxy to the live service, store what came back, then serve it
+    def record(self, parts, key):
+        if parts.path.startswith(API_PREFIX):
+            params = dict(parse_qsl(parts.query, keep_blank_values=True))
+            params["api_key"] = TMDB_API_KEY
+            url = f"{LIVE_TMDB_API_URL}/{parts.path[len(API_PREFIX):]}"
+        else:
+            params = parts.query
+            url = f"{LIVE_BASE_URL}{parts.path}"
+
+        try:
+            response = self.upstream.get(url, params=params, timeout=30)
+        except requests.RequestException as e:
+            # Nothing is stored, so the next record run retries this request. The error text carries the
+            # upstream URL with the API key, so only its type is reported.
+            logger.warning(f"Upstream request for {key} failed: {type(e).__name__}")
+            return error_response(parts, 502, f"Upstream request failed: {type(e).__name__}")
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        self.store.save(key, response.status_code, content_type, response.content)
+
+        if parts.path.startswith(API_PREFIX) and response.ok and "json" in content_type:
+            default_media = "tv" if "/tv" in parts.path else "movie"
+            by_media = {}
+            for item in response.json().get("results", []):
+                by_media.setdefault(item.get("media_type", default_media), []).append(item)
+            for media, results in by_media.items():
+                self.store.add_to_catalogue(media, results)
+        logger.info(f"Recorded {key} -> {response.status_code}")
+        return response.status_code, content_type, response.content
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m utils.stub_server [record|replay]
+    server = StubServer(mode=sys.argv[1] if len(sys.argv) > 1 else "replay").start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
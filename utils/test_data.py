@@ -2,9 +2,19 @@
 TYPE_DATA = ["Movie", "TV Shows"]
 YEAR_RANGE_DATA = [(1900, 2024), (2000, 2020)]
 GENRE_NAME = "Action"
+GENRE_DATA = ["Action", "Comedy", "Drama", "Animation", "Documentary"]
+RATING_DATA = [1, 2, 3, 4, 5]
 CATEGORY_DATA = {
     "Popular": "popular",
     "Trend": "trend",
     "Newest": "new",
     "Top rated": "top"
 }
+# Filter combinations checked against /discover (see utils/cross_check.py)
+CROSS_CHECK_DATA = [
+    {"category": "Popular"},
+    {"type_name": "Movie", "genre": "Action"},
+    {"type_name": "Movie", "year_range": (2000, 2020)},
+    {"type_name": "TV Shows", "stars": 4},
+    {"category": "Top rated", "genre": "Action", "year_range": (2000, 2020), "stars": 3},
+]
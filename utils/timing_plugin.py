@@ -0,0 +1,109 @@
+import html
+import json
+import os
+from collections import defaultdict
+import pytest
+from utils.config import REPORTS_DIR
+from utils.instrumentation import timings
+
+# pytest plugin: attributes instrumentation events to test phases and reports them
+# (per-test HTML table, reports/timings.json, terminal summary)
+
+TIMINGS_FILE = os.path.join(REPORTS_DIR, "timings.json")
+SUMMARY_SIZE = 5
+
+_results = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    timings.start_phase("setup")
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    timings.start_phase("call")
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    timings.start_phase("teardown")
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "teardown":
+        return
+
+    # user_properties travel from xdist workers to the controller with the report
+    breakdown = timings.collect()
+    report.user_properties.append(("timings", breakdown))
+
+    from pytest_html import extras
+    table = _html_table(breakdown)
+    if hasattr(report, "extra"):
+        report.extra.append(extras.html(table))
+    else:
+        report.extra = [extras.html(table)]
+
+
+def pytest_runtest_logreport(report):
+    entry = _results.setdefault(report.nodeid, {"duration": 0.0})
+    entry["duration"] += report.duration
+    if report.when == "teardown":
+        for name, value in report.user_properties:
+            if name == "timings":
+                entry.update(value)
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput") or not _results:
+        return
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    with open(TIMINGS_FILE, "w", encoding="utf-8") as f:
+        json.dump(_results, f, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("timing summary")
+
+    slowest = sorted(_results.items(), key=lambda item: item[1].get("duration", 0), reverse=True)
+    write("Slowest tests:")
+    for nodeid, entry in slowest[:SUMMARY_SIZE]:
+        write(f"  {entry.get('duration', 0):7.2f}s  {nodeid}")
+
+    locators = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+    for entry in _results.values():
+        for value, stats in entry.get("locators", {}).items():
+            locators[value]["count"] += stats["count"]
+            locators[value]["seconds"] += stats["seconds"]
+    if locators:
+        write("Slowest locators:")
+        for value, stats in sorted(locators.items(), key=lambda item: item[1]["seconds"], reverse=True)[:SUMMARY_SIZE]:
+            write(f"  {stats['seconds']:7.2f}s  {stats['count']:5d}x  {value}")
+
+    waited = sum(entry.get("wait_seconds", 0.0) for entry in _results.values())
+    write(f"Total time in readiness waits: {waited:.2f}s")
+    write(f"Per-test breakdown: {TIMINGS_FILE}")
+
+
+def _html_table(breakdown):
+    rows = []
+    for phase, kinds in breakdown["phases"].items():
+        for kind, stats in kinds.items():
+            rows.append(f"<tr><td>{phase}</td><td>{kind}</td><td>{stats['count']}</td><td>{stats['seconds'] * 1000:.0f}</td></tr>")
+    for command, stats in sorted(breakdown["commands"].items(), key=lambda item: item[1]["seconds"], reverse=True):
+        rows.append(f"<tr><td></td><td>{html.escape(command)}</td><td>{stats['count']}</td><td>{stats['seconds'] * 1000:.0f}</td></tr>")
+    return (
+        "<table><tr><th>Phase</th><th>Command</th><th>Count</th><th>ms</th></tr>"
+        + "".join(rows)
+        + "</table>"
+    )
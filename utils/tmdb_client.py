@@ -0,0 +1,129 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from utils.config import TMDB_API_URL, TMDB_API_KEY, API_MAX_CONNECTIONS
+from utils.instrumentation import timings
+from utils.logger import get_logger
+from utils.request_scheduler import RequestScheduler
+from utils.response_cache import CachedEntry, ResponseCache, cache_key
+
+logger = get_logger(__name__)
+
+
+class TMDBClient:
+    """Keep-alive TMDB API client that injects the base URL and API key into every request.
+
+    With a ResponseCache, identical GETs are answered from the cache while fresh and
+    revalidated with If-None-Match / If-Modified-Since once their TTL runs out. Every request
+    that reaches the network goes through the RequestScheduler (rate limit, timeouts, retries).
+    """
+
+    def __init__(self, base_url=TMDB_API_URL, api_key=TMDB_API_KEY, max_connections=API_MAX_CONNECTIONS,
+                 cache: Optional[ResponseCache] = None, scheduler: Optional[RequestScheduler] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.cache = cache
+        # Concurrency on the wire is the scheduler's call (API_MAX_IN_FLIGHT); max_connections sizes the pools
+        self.scheduler = scheduler or RequestScheduler()
+        self.session = requests.Session()
+        # Pool as many connections as we fire requests concurrently, so nothing waits on a socket
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="tmdb")
+
+    def get(self, path: str, params: Optional[dict] = None) -> requests.Response:
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        if self.cache is None:
+            return self._send(path, url, params)
+
+        key = cache_key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry, path):
+            self.cache.stats.add("hits")
+            logger.info(f"GET {path} {self._describe(params)} -> {entry.status_code} (cached)")
+            return entry.to_response()
+
+        response = self._send(path, url, params, entry.conditional_headers() if entry else None)
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats.add("revalidated")
+            self.cache.refresh(key, entry)
+            return entry.to_response()
+
+        self.cache.stats.add("misses")
+        if response.status_code == 200:
+            self.cache.put(key, CachedEntry.from_response(response))
+            self.cache.stats.add("stored")
+        return response
+
+    def _send(self, path, url, params, headers=None) -> requests.Response:
+        query = dict(params or {})
+        query["api_key"] = self.api_key
+        start = time.perf_counter()
+        try:
+            response = self.scheduler.send(
+                lambda timeout: self.session.get(url, params=query, headers=headers, timeout=timeout), f"GET {path}"
+            )
+        finally:
+            timings.record("http", f"GET {path}", time.perf_counter() - start)
+        logger.info(f"GET {path} {self._describe(params)} -> {response.status_code}")
+        return response
+
+    # GET /movie/{category} (popular, top_rated, now_playing, upcoming)
+    def get_movie_list(self, category: str, page: int = 1) -> requests.Response:
+        return self.get(f"movie/{category}", {"page": page})
+
+    # GET /discover/movie with the filters the UI exposes
+    def discover_movies(
+        self,
+        page: int = 1,
+        sort_by: str = "popularity.desc",
+        release_date_gte: Optional[str] = None,
+        release_date_lte: Optional[str] = None,
+        vote_average_gte: Optional[float] = None,
+        vote_average_lte: Optional[float] = None,
+        **extra,
+    ) -> requests.Response:
+        params = {
+            "sort_by": sort_by,
+            "release_date.gte": release_date_gte,
+            "release_date.lte": release_date_lte,
+            "vote_average.gte": vote_average_gte,
+            "vote_average.lte": vote_average_lte,
+            "page": page,
+        }
+        params.update(extra)
+        return self.get("discover/movie", {k: v for k, v in params.items() if v is not None})
+
+    # Start a request callable on the client's pool and return its Future, so the caller can work meanwhile
+    def submit(self, call: Callable[[], requests.Response]) -> Future:
+        return self._executor.submit(call)
+
+    # Run request callables concurrently; results come back in submission order
+    def run_concurrently(self, calls: Iterable[Callable[[], requests.Response]]) -> List[requests.Response]:
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    # Same as run_concurrently, but yields (index, response) as each request finishes
+    def iter_concurrently(self, calls: Iterable[Callable[[], requests.Response]]) -> Iterator[Tuple[int, requests.Response]]:
+        futures = {self._executor.submit(call): index for index, call in enumerate(calls)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def get_movie_list_pages(self, category: str, pages: Iterable[int]) -> Dict[int, requests.Response]:
+        pages = list(pages)
+        responses = self.run_concurrently(
+            [lambda page=page: self.get_movie_list(category, page) for page in pages]
+        )
+        return dict(zip(pages, responses))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    @staticmethod
+    def _describe(params):
+        return " ".join(f"{k}={v}" for k, v in (params or {}).items())
@@ -0,0 +1,37 @@
+import os
+import re
+
+# xdist appends "@<group>" to node ids under --dist loadgroup
+GROUP_SUFFIX = re.compile(r"@[\w.:/-]+$")
+
+
+def worker_id():
+    """Return the pytest-xdist worker id ("gw0", "gw1", ...) or "master" when running serially."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def is_worker():
+    return worker_id() != "master"
+
+
+# Numeric worker index (gw3 -> 3), 0 when running serially
+def worker_index():
+    return int(worker_id()[2:]) if is_worker() else 0
+
+
+# Suffix a file name with the worker id so parallel workers never share a file
+def worker_file_name(file_name):
+    if not is_worker():
+        return file_name
+    stem, ext = os.path.splitext(file_name)
+    return f"{stem}-{worker_id()}{ext}"
+
+
+# Number of parallel workers in this session, 1 when running serially
+def worker_count():
+    return int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+# The node id without the xdist "@<group>" suffix, so results match across --dist modes
+def base_nodeid(nodeid):
+    return GROUP_SUFFIX.sub("", nodeid)